@@ -5,14 +5,55 @@
 from .hill_cipher import (
     text_to_numbers,
     numbers_to_text,
+    split_into_blocks,
+    hill_multiply_blocks,
     hill_encrypt_standard,
     hill_encrypt_modified,
     hill_decrypt_standard,
     hill_decrypt_modified
 )
 
+from .alphabet_codec import (
+    AlphabetCodec,
+    get_alphabet_codec,
+    get_case_conversion_mode
+)
+
+from .hill_key import (
+    HillKey,
+    CirculantKey,
+    as_hill_key,
+    generate_hill_key
+)
+
+from .key_bundle import (
+    KeyBundle,
+    save_key_bundle,
+    load_key_bundle
+)
+
+from .key_recovery import (
+    recover_key,
+    recover_key_from_text,
+    inverse_row_candidates,
+    InverseRowSearch,
+    CrtInverseRowSearch
+)
+
+from .key_cache import (
+    InverseCache,
+    get_key_cache
+)
+
+from .noise import (
+    secure_residues,
+    SecureNoise,
+    CounterNoise
+)
+
 from .substitution import (
     generate_random_substitution,
+    generate_random_substitutions,
     create_shift_substitution,
     create_reverse_substitution,
     invert_substitution,
@@ -21,8 +62,18 @@ from .substitution import (
     apply_substitution_multiple,
     compose_substitutions,
     substitution_order,
+    substitution_cycles,
+    SubstitutionPowers,
+    Permutation,
+    as_substitution_powers,
     substitution_to_string,
     string_to_substitution,
+    substitution_to_lehmer,
+    substitution_from_lehmer,
+    substitution_to_bytes,
+    substitution_from_bytes,
+    read_substitution,
+    write_substitution,
     get_template_substitution,
     SUBSTITUTION_TEMPLATES
 )
@@ -31,12 +82,35 @@ __all__ = [
     # Hill Cipher
     'text_to_numbers',
     'numbers_to_text',
+    'split_into_blocks',
+    'hill_multiply_blocks',
     'hill_encrypt_standard',
     'hill_encrypt_modified',
     'hill_decrypt_standard',
     'hill_decrypt_modified',
+    'HillKey',
+    'CirculantKey',
+    'as_hill_key',
+    'generate_hill_key',
+    'KeyBundle',
+    'save_key_bundle',
+    'load_key_bundle',
+    'recover_key',
+    'recover_key_from_text',
+    'inverse_row_candidates',
+    'InverseRowSearch',
+    'CrtInverseRowSearch',
+    'InverseCache',
+    'get_key_cache',
+    'AlphabetCodec',
+    'get_alphabet_codec',
+    'get_case_conversion_mode',
+    'secure_residues',
+    'SecureNoise',
+    'CounterNoise',
     # Substitution
     'generate_random_substitution',
+    'generate_random_substitutions',
     'create_shift_substitution',
     'create_reverse_substitution',
     'invert_substitution',
@@ -45,8 +119,18 @@ __all__ = [
     'apply_substitution_multiple',
     'compose_substitutions',
     'substitution_order',
+    'substitution_cycles',
+    'SubstitutionPowers',
+    'Permutation',
+    'as_substitution_powers',
     'substitution_to_string',
     'string_to_substitution',
+    'substitution_to_lehmer',
+    'substitution_from_lehmer',
+    'substitution_to_bytes',
+    'substitution_from_bytes',
+    'read_substitution',
+    'write_substitution',
     'get_template_substitution',
     'SUBSTITUTION_TEMPLATES'
 ]
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Кодек алфавіту: перетворення тексту в індекси і назад через таблиці
+"""
+
+from functools import lru_cache
+import numpy as np
+
+
+def get_case_conversion_mode(alphabet):
+    """
+    Визначає режим конвертації регістру на основі складу алфавіту.
+
+    Повертає:
+    - 'upper': якщо алфавіт містить великі літери і не містить малих
+    - 'lower': якщо алфавіт містить малі літери і не містить великих
+    - None: якщо алфавіт містить обидва регістри або не містить літер
+    """
+    has_upper = False
+    has_lower = False
+
+    for char in alphabet:
+        if char.isupper() and char.lower() in alphabet:
+            # Є пара великої і малої літери - не конвертуємо
+            return None
+        if char.isupper():
+            has_upper = True
+        if char.islower():
+            has_lower = True
+
+    # Якщо є тільки великі літери - конвертуємо в великі
+    if has_upper and not has_lower:
+        return 'upper'
+
+    # Якщо є тільки малі літери - конвертуємо в малі
+    if has_lower and not has_upper:
+        return 'lower'
+
+    # Інакше не конвертуємо
+    return None
+
+
+class _EncodeTable(dict):
+    """
+    Таблиця для str.translate: код символу -> chr(індекс в алфавіті).
+    Символи, яких немає в алфавіті, відображаються в None (видаляються).
+    Кожен новий символ обробляється один раз, далі береться з таблиці.
+    """
+
+    def __init__(self, alphabet, case_mode):
+        super().__init__()
+        self.alphabet = alphabet
+        self.case_mode = case_mode
+
+    def __missing__(self, code):
+        char = chr(code)
+
+        # Застосовуємо конвертацію регістру якщо потрібно
+        if self.case_mode == 'upper':
+            char = char.upper()
+        elif self.case_mode == 'lower':
+            char = char.lower()
+
+        value = chr(self.alphabet.index(char)) if char in self.alphabet else None
+        self[code] = value
+        return value
+
+
+class AlphabetCodec:
+    """
+    Кодек для одного алфавіту.
+    Режим регістру, таблиця кодування і масив символів обчислюються один раз,
+    після чого кодування виконується через str.translate, а декодування -
+    одним індексуванням numpy масиву.
+    """
+
+    def __init__(self, alphabet):
+        self.alphabet = alphabet
+        self.size = len(alphabet)
+        self.case_mode = get_case_conversion_mode(alphabet)
+
+        # Найменший тип, у який вміщуються всі індекси
+        if self.size <= 0x100:
+            self.dtype = np.uint8
+        elif self.size <= 0x10000:
+            self.dtype = np.uint16
+        else:
+            self.dtype = np.uint32
+
+        self._encode_table = _EncodeTable(alphabet, self.case_mode)
+        self._symbols = np.frombuffer(alphabet.encode("utf-32-le", "surrogatepass"), dtype="<u4")
+
+    def encode(self, text):
+        """
+        Конвертує текст в масив індексів. Символи поза алфавітом пропускаються.
+
+        Args:
+            text: вхідний текст
+
+        Returns:
+            numpy array: індекси символів (тип self.dtype)
+        """
+        if not isinstance(text, str):
+            raise ValueError("Очікується текст, але отримано інший тип.")
+
+        translated = text.translate(self._encode_table)
+
+        if self.dtype == np.uint8:
+            return np.frombuffer(translated.encode("latin-1"), dtype=np.uint8)
+
+        codes = np.frombuffer(translated.encode("utf-32-le", "surrogatepass"), dtype="<u4")
+        return codes.astype(self.dtype)
+
+    def decode(self, numbers):
+        """
+        Конвертує індекси в текст. Індекси поза діапазоном алфавіту пропускаються.
+
+        Args:
+            numbers: список або numpy array індексів
+
+        Returns:
+            str: текст
+        """
+        arr = np.asarray(numbers)
+        if arr.size == 0:
+            return ""
+
+        arr = arr.ravel()
+        valid = (arr >= 0) & (arr < self.size)
+        if not valid.all():
+            arr = arr[valid]
+
+        return self._symbols[arr].tobytes().decode("utf-32-le", "surrogatepass")
+
+
+@lru_cache(maxsize=32)
+def get_alphabet_codec(alphabet):
+    """Повертає кодек для алфавіту (створюється один раз на алфавіт)"""
+    return AlphabetCodec(alphabet)
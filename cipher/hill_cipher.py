@@ -3,100 +3,72 @@
 """
 
 import numpy as np
-import secrets
-from utils.math_utils import matrix_mod_inverse, validate_matrix_determinant_reversibility
+from .alphabet_codec import get_alphabet_codec
+from .hill_key import as_hill_key
+from .noise import SecureNoise
+from .substitution import as_substitution_powers
 
 
-def get_case_conversion_mode(alphabet):
-    """
-    Визначає режим конвертації регістру на основі складу алфавіту.
-
-    Повертає:
-    - 'upper': якщо алфавіт містить великі літери і не містить малих
-    - 'lower': якщо алфавіт містить малі літери і не містить великих
-    - None: якщо алфавіт містить обидва регістри або не містить літер
-    """
-    has_upper = False
-    has_lower = False
+def text_to_numbers(text, alphabet):
+    """Конвертує текст в числа згідно з алфавітом (numpy array компактного типу)"""
+    return get_alphabet_codec(alphabet).encode(text)
 
-    for char in alphabet:
-        if char.isupper() and char.lower() in alphabet:
-            # Є пара великої і малої літери - не конвертуємо
-            return None
-        if char.isupper():
-            has_upper = True
-        if char.islower():
-            has_lower = True
 
-    # Якщо є тільки великі літери - конвертуємо в великі
-    if has_upper and not has_lower:
-        return 'upper'
+def numbers_to_text(numbers, alphabet):
+    """Конвертує числа в текст згідно з алфавітом"""
+    return get_alphabet_codec(alphabet).decode(numbers)
 
-    # Якщо є тільки малі літери - конвертуємо в малі
-    if has_lower and not has_upper:
-        return 'lower'
 
-    # Інакше не конвертуємо
-    return None
+def split_into_blocks(numbers, n):
+    """
+    Розбиває послідовність чисел на масив блоків (кількість_блоків × n).
+    Неповний останній блок доповнюється нулями.
 
+    Args:
+        numbers: список або numpy array індексів символів
+        n: розмір блоку (розмір матриці)
 
-def text_to_numbers(text, alphabet):
-    """Конвертує текст в числа згідно з алфавітом"""
-    if not isinstance(text, str):
-        raise ValueError("Очікується текст, але отримано інший тип.")
+    Returns:
+        numpy array: масив блоків форми (кількість_блоків, n)
+    """
+    arr = np.asarray(numbers, dtype=np.int64).ravel()
 
-    # Визначаємо режим конвертації регістру
-    case_mode = get_case_conversion_mode(alphabet)
+    remainder = len(arr) % n
+    if remainder:
+        arr = np.concatenate([arr, np.zeros(n - remainder, dtype=np.int64)])
 
-    result = []
-    for char in text:
-        # Застосовуємо конвертацію регістру якщо потрібно
-        converted_char = char
-        if case_mode == 'upper':
-            converted_char = char.upper()
-        elif case_mode == 'lower':
-            converted_char = char.lower()
+    return arr.reshape(-1, n)
 
-        # Додаємо тільки ті символи, які є в алфавіті
-        if converted_char in alphabet:
-            result.append(alphabet.index(converted_char))
 
-    return result
+def hill_multiply_blocks(blocks, matrix, mod_val):
+    """
+    Множить усі блоки тексту на матрицю одним матричним добутком.
+    Для кожного блоку v обчислюється matrix · v (mod mod_val).
 
+    Args:
+        blocks: numpy array форми (кількість_блоків, n)
+        matrix: numpy array форми (n, n) або (k, n) для часткового добутку
+        mod_val: модуль
 
-def numbers_to_text(numbers, alphabet):
-    """Конвертує числа в текст згідно з алфавітом"""
-    return ''.join(alphabet[num] for num in numbers if 0 <= num < len(alphabet))
+    Returns:
+        numpy array: масив форми (кількість_блоків, k) за модулем
+    """
+    return np.mod(blocks @ matrix.T, mod_val)
 
 
 def hill_encrypt_standard(numbers, key_matrix, alph):
-    """Стандартне шифрування Хілла"""
-    n = len(key_matrix)
+    """Стандартне шифрування Хілла (key_matrix — матриця, CirculantMatrix або HillKey)"""
     mod_val = len(alph)
 
-    # Перевірка оборотності детермінанта за модулем
-    is_valid, det, error_msg = validate_matrix_determinant_reversibility(key_matrix, mod_val)
-    if not is_valid:
-        raise ValueError(error_msg)
-
-    numbers = numbers.copy()
-    while len(numbers) % n != 0:
-        numbers.append(0)
-
-    encrypted_numbers = []
-    mat = np.array(key_matrix, dtype=np.int64)
+    # Перевірка оборотності виконується один раз при створенні ключа
+    key = as_hill_key(key_matrix, mod_val)
+    blocks = split_into_blocks(numbers, key.size)
 
-    for i in range(0, len(numbers), n):
-        block = numbers[i:i + n]
-        vec = np.array(block, dtype=np.int64)
-        res = np.dot(mat, vec)
-        res = np.mod(res, mod_val).astype(int)
-        encrypted_numbers.extend(res.tolist())
+    return key.encrypt_blocks(blocks).ravel()
 
-    return encrypted_numbers
 
-
-def hill_encrypt_modified(text, key_matrix, alph, subst_map, noise_length=0):
+def hill_encrypt_modified(text, key_matrix, alph, subst_map, noise_length=0,
+                          noise_source=None, first_block=0):
     """
     Модифіковане шифрування Хілла з підстановкою і шумом
 
@@ -106,17 +78,21 @@ def hill_encrypt_modified(text, key_matrix, alph, subst_map, noise_length=0):
     3. Останній блок: {залишок тексту}{padding}{шум}
     4. Множення на матрицю
     5. Застосування підстановки (block_index + 1) разів
+
+    Усі блоки обробляються разом: один матричний добуток для всього тексту,
+    а степені підстановки застосовуються до масиву блоків за один прохід.
+
+    noise_source - джерело шуму (SecureNoise за замовчуванням, або CounterNoise
+    для відтворюваного шуму). first_block - глобальний індекс першого блоку:
+    текст можна розбити на частини по кратній (matrix_size - noise_length)
+    кількості символів і шифрувати їх незалежно, об'єднання результатів
+    збігається з шифруванням усього тексту.
     """
     numbers = text_to_numbers(text, alph)
-    n = len(key_matrix)
     mod_val = len(alph)
 
-    # Перевірка оборотності детермінанта за модулем
-    is_valid, det, error_msg = validate_matrix_determinant_reversibility(key_matrix, mod_val)
-    if not is_valid:
-        raise ValueError(error_msg)
-
-    mat = np.array(key_matrix, dtype=np.int64)
+    key = as_hill_key(key_matrix, mod_val)
+    n = key.size
 
     if noise_length < 0:
         raise ValueError("Довжина шуму має бути >= 0")
@@ -127,68 +103,48 @@ def hill_encrypt_modified(text, key_matrix, alph, subst_map, noise_length=0):
     # Розмір корисної частини блоку
     useful_size = n - noise_length
 
-    encrypted_numbers = []
-    block_index = 0
-
-    # Обробка блоків
-    i = 0
-    while i < len(numbers):
-        # Беремо корисні символи
-        useful_part = numbers[i:i + useful_size]
+    # Степені підстановки обчислюються через її цикли
+    powers = as_substitution_powers(subst_map)
 
-        # Формуємо блок
-        if len(useful_part) == useful_size:
-            # Повний блок: корисні символи + шум
-            noise = [secrets.randbelow(mod_val) for _ in range(noise_length)]
-            block = useful_part + noise
-        else:
-            # Останній неповний блок: корисні символи + padding + шум
-            padding_needed = useful_size - len(useful_part)
-            padding = [0] * padding_needed  # Padding символом з індексом 0
-            noise = [secrets.randbelow(mod_val) for _ in range(noise_length)]
-            block = useful_part + padding + noise
+    # Корисні частини блоків; останній неповний блок доповнюється
+    # padding символом з індексом 0
+    useful_blocks = split_into_blocks(numbers, useful_size)
+    block_count = useful_blocks.shape[0]
 
-        # Множення на матрицю
-        vec = np.array(block, dtype=np.int64)
-        res = np.dot(mat, vec)
-        res = np.mod(res, mod_val).astype(int).tolist()
+    # Шум у кінці кожного блоку
+    if noise_source is None:
+        noise_source = SecureNoise()
+    noise = noise_source.blocks(first_block, block_count, noise_length, mod_val)
 
-        # Застосування підстановки (block_index + 1) разів
-        times_to_substitute = block_index + 1
-        for _ in range(times_to_substitute):
-            res = [subst_map[x % len(subst_map)] for x in res]
+    blocks = np.hstack([useful_blocks, noise])
 
-        encrypted_numbers.extend(res)
+    # Множення на матрицю
+    res = key.encrypt_blocks(blocks)
 
-        i += useful_size
-        block_index += 1
+    # Застосування підстановки (block_index + 1) разів: блок з індексом k
+    # отримує σ^(k + 1), всі блоки обробляються одним індексуванням
+    exponents = np.arange(first_block + 1, first_block + block_count + 1, dtype=np.int64)[:, None]
+    res = powers.apply(res, exponents)
 
-    return "".join(alph[num % mod_val] for num in encrypted_numbers)
+    return numbers_to_text(np.mod(res.ravel(), mod_val), alph)
 
 
 def hill_decrypt_standard(ciphertext_numbers, key_matrix, alph):
-    """Стандартне розшифрування Хілла"""
-    n = len(key_matrix)
+    """Стандартне розшифрування Хілла (key_matrix — матриця або HillKey)"""
     mod_val = len(alph)
 
-    key_matrix_np = np.array(key_matrix, dtype=np.int64)
-    inv_key = matrix_mod_inverse(key_matrix_np, mod_val)
+    key = as_hill_key(key_matrix, mod_val)
+    n = key.size
 
     if len(ciphertext_numbers) % n != 0:
         raise ValueError("Довжина зашифрованого тексту некоректна.")
 
-    decrypted_numbers = []
-    for i in range(0, len(ciphertext_numbers), n):
-        block = ciphertext_numbers[i:i + n]
-        vec = np.array(block, dtype=np.int64)
-        res = np.dot(inv_key, vec)
-        res = np.mod(res, mod_val).astype(int)
-        decrypted_numbers.extend(res.tolist())
+    blocks = split_into_blocks(ciphertext_numbers, n)
 
-    return decrypted_numbers
+    return key.decrypt_blocks(blocks).ravel()
 
 
-def hill_decrypt_modified(text, key_matrix, alph, subst_map, noise_length=0):
+def hill_decrypt_modified(text, key_matrix, alph, subst_map, noise_length=0, first_block=0):
     """
     Модифіковане розшифрування Хілла з підстановкою і шумом
 
@@ -197,11 +153,13 @@ def hill_decrypt_modified(text, key_matrix, alph, subst_map, noise_length=0):
     2. Застосувати зворотну підстановку (block_index + 1) разів
     3. Множення на обернену матрицю
     4. Видалити noise_length символів з кінця кожного блоку
+
+    first_block - глобальний індекс першого блоку (для розшифрування частинами).
     """
-    n = len(key_matrix)
     mod_val = len(alph)
-    key_matrix_np = np.array(key_matrix, dtype=np.int64)
-    inv_key = matrix_mod_inverse(key_matrix_np, mod_val)
+
+    key = as_hill_key(key_matrix, mod_val)
+    n = key.size
 
     ciphertext_numbers = text_to_numbers(text, alph)
 
@@ -215,43 +173,26 @@ def hill_decrypt_modified(text, key_matrix, alph, subst_map, noise_length=0):
         raise ValueError(f"Довжина шуму ({noise_length}) має бути менше розміру матриці ({n})")
 
     # Якщо немає підстановки - стандартне розшифрування
-    if not subst_map:
-        decrypted_numbers = []
-        for i in range(0, len(ciphertext_numbers), n):
-            block = ciphertext_numbers[i:i + n]
-            vec = np.array(block, dtype=np.int64)
-            res = np.dot(inv_key, vec)
-            res = np.mod(res, mod_val).astype(int)
-            decrypted_numbers.extend(res.tolist())
+    if subst_map is None or len(subst_map) == 0:
+        blocks = split_into_blocks(ciphertext_numbers, n)
+        decrypted_numbers = key.decrypt_blocks(blocks).ravel()
         return numbers_to_text(decrypted_numbers, alph)
 
-    # Створення оберненої підстановки
-    n_subst = len(subst_map)
-    inv_subst = [0] * n_subst
-    for i, val in enumerate(subst_map):
-        inv_subst[val % n_subst] = i
+    # Степені оберненої підстановки - від'ємні степені σ
+    powers = as_substitution_powers(subst_map)
 
     # Розмір корисної частини блоку
     useful_size = n - noise_length
 
-    # Реверсування підстановки і розшифрування
-    decrypted_useful_parts = []
-
-    for block_index, i in enumerate(range(0, len(ciphertext_numbers), n)):
-        block = ciphertext_numbers[i:i + n]
-        block_times = block_index + 1
-
-        # Застосування зворотної підстановки
-        for _ in range(block_times):
-            block = [inv_subst[x % n_subst] for x in block]
+    blocks = split_into_blocks(ciphertext_numbers, n)
+    block_count = blocks.shape[0]
 
-        # Розшифрування блоку
-        vec = np.array(block, dtype=np.int64)
-        res = np.dot(inv_key, vec)
-        res = np.mod(res, mod_val).astype(int).tolist()
+    # Застосування зворотної підстановки: блок k отримує σ^-(k + 1)
+    exponents = -np.arange(first_block + 1, first_block + block_count + 1, dtype=np.int64)[:, None]
+    blocks = powers.apply(blocks, exponents)
 
-        # Видалення шуму (останні noise_length елементів)
-        useful_part = res[:useful_size]
-        decrypted_useful_parts.extend(useful_part)
+    # Розшифрування всіх блоків. Шум (останні noise_length елементів блоку)
+    # відкидається, тому множимо тільки на перші useful_size рядків оберненої матриці
+    res = key.decrypt_blocks(blocks, rows=useful_size)
 
-    return numbers_to_text(decrypted_useful_parts, alph)
\ No newline at end of file
+    return numbers_to_text(res.ravel(), alph)
\ No newline at end of file
@@ -0,0 +1,447 @@
+"""
+Скомпільований ключ шифру Хілла
+"""
+
+import hashlib
+import secrets
+import numpy as np
+from utils.math_utils import (
+    CirculantMatrix,
+    circulant_inverse_row,
+    matrix_mod_inverse,
+    validate_matrix_determinant_reversibility
+)
+from .noise import secure_residues
+from .substitution import substitution_cycles
+
+# Мінімальний розмір циркулянтного ключа, з якого множення виконується через FFT
+_FFT_MIN_SIZE = 32
+
+# Межа для n * (m - 1)^2, при якій округлення результату FFT гарантовано точне
+_FFT_EXACT_LIMIT = 2 ** 40
+
+
+class HillKey:
+    """
+    Ключова матриця шифру Хілла разом з модулем алфавіту.
+
+    Оборотність матриці перевіряється один раз при створенні ключа,
+    обернена матриця обчислюється при першому зверненні і кешується,
+    тому повторні шифрування/розшифрування не перераховують їх.
+    """
+
+    def __init__(self, matrix, modulus):
+        """
+        Args:
+            matrix: квадратна матриця (list of lists або numpy array)
+            modulus: модуль (розмір алфавіту)
+
+        Raises:
+            ValueError: якщо матриця не квадратна або не оборотна за модулем
+        """
+        if modulus < 2:
+            raise ValueError("Модуль має бути >= 2")
+
+        mat = np.array(matrix, dtype=np.int64)
+        if mat.ndim != 2 or mat.shape[0] != mat.shape[1] or mat.shape[0] == 0:
+            raise ValueError("Матриця повинна бути квадратною!")
+
+        mat = np.mod(mat, modulus)
+
+        # Перевірка оборотності детермінанта за модулем
+        is_valid, det, error_msg = validate_matrix_determinant_reversibility(mat, modulus)
+        if not is_valid:
+            raise ValueError(error_msg)
+
+        mat.setflags(write=False)
+
+        self.matrix = mat
+        self.modulus = modulus
+        self.size = mat.shape[0]
+        self.det = det
+
+        self._inverse = None
+        self._fingerprint = None
+
+    @classmethod
+    def from_parts(cls, matrix, modulus, inverse, det=None, fingerprint=None):
+        """
+        Створює ключ з уже перевіреної матриці та її оберненої без повторної
+        перевірки (наприклад, після batch_matrix_mod_inverse). Елементи мають
+        бути вже зведені за модулем; масиви int64 використовуються без копіювання.
+
+        Args:
+            matrix: матриця ключа
+            modulus: модуль (розмір алфавіту)
+            inverse: обернена матриця за модулем
+            det: детермінант за модулем (якщо відомий)
+            fingerprint: відбиток ключа (якщо відомий)
+        """
+        key = cls.__new__(cls)
+
+        mat = np.asarray(matrix, dtype=np.int64)
+        inv = np.asarray(inverse, dtype=np.int64)
+        if mat.ndim != 2 or mat.shape[0] != mat.shape[1] or inv.shape != mat.shape:
+            raise ValueError("Розмір оберненої матриці не відповідає ключу")
+        mat.setflags(write=False)
+        inv.setflags(write=False)
+
+        key.matrix = mat
+        key.modulus = modulus
+        key.size = mat.shape[0]
+        key.det = det
+        key._inverse = inv
+        key._fingerprint = fingerprint
+        return key
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"HillKey(size={self.size}, modulus={self.modulus}, fingerprint={self.fingerprint[:12]})"
+
+    @property
+    def inverse(self):
+        """Обернена матриця за модулем (обчислюється один раз)"""
+        if self._inverse is None:
+            inv = np.mod(np.asarray(matrix_mod_inverse(self.matrix, self.modulus), dtype=np.int64), self.modulus)
+            inv.setflags(write=False)
+            self._inverse = inv
+        return self._inverse
+
+    @property
+    def has_inverse(self):
+        """True, якщо обернена матриця вже обчислена або завантажена"""
+        return self._inverse is not None
+
+    def attach_inverse(self, inverse):
+        """
+        Встановлює обернену матрицю, отриману ззовні (кеш, файл ключа),
+        щоб не обчислювати її повторно.
+
+        Args:
+            inverse: обернена матриця за модулем
+        """
+        inv = np.mod(np.array(inverse, dtype=np.int64), self.modulus)
+        if inv.shape != (self.size, self.size):
+            raise ValueError("Розмір оберненої матриці не відповідає ключу")
+        inv.setflags(write=False)
+        self._inverse = inv
+
+    @property
+    def fingerprint(self):
+        """SHA-256 відбиток ключа (модуль, розмір та елементи матриці)"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            digest.update(f"{self.modulus}:{self.size}:".encode("ascii"))
+            digest.update(np.ascontiguousarray(self.matrix, dtype="<i8").tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def tolist(self):
+        """Матриця ключа як list of lists"""
+        return self.matrix.tolist()
+
+    def encrypt_blocks(self, blocks):
+        """
+        Множить усі блоки на матрицю ключа: matrix · v (mod m) для кожного блоку.
+
+        Args:
+            blocks: numpy array форми (кількість_блоків, n)
+
+        Returns:
+            numpy array: масив форми (кількість_блоків, n)
+        """
+        return np.mod(blocks @ self.matrix.T, self.modulus)
+
+    def decrypt_blocks(self, blocks, rows=None):
+        """
+        Множить усі блоки на обернену матрицю.
+
+        Args:
+            blocks: numpy array форми (кількість_блоків, n)
+            rows: якщо задано, обчислюються тільки перші rows елементів
+                  кожного блоку (наприклад, без шуму)
+
+        Returns:
+            numpy array: масив форми (кількість_блоків, rows або n)
+        """
+        inv = self.inverse if rows is None else self.inverse[:rows]
+        return np.mod(blocks @ inv.T, self.modulus)
+
+
+class CirculantKey(HillKey):
+    """
+    Циркулянтний ключ, заданий тільки першим рядком - O(n) пам'яті.
+
+    Оборотність перевіряється обертанням многочлена першого рядка,
+    обернений ключ - теж циркулянт, тому зберігається тільки його перший
+    рядок. Множення блоку на циркулянт - циклічна кореляція з першим
+    рядком, яка для великих n обчислюється для всіх блоків разом через
+    FFT за O(n log n) на блок. Повна матриця будується тільки при
+    зверненні до matrix або inverse.
+    """
+
+    def __init__(self, first_row, modulus):
+        """
+        Args:
+            first_row: перший рядок циркулянтної матриці
+            modulus: модуль (розмір алфавіту)
+
+        Raises:
+            ValueError: якщо циркулянтна матриця не оборотна за модулем
+        """
+        if modulus < 2:
+            raise ValueError("Модуль має бути >= 2")
+
+        row = np.mod(np.array(first_row, dtype=np.int64).ravel(), modulus)
+        if row.size == 0:
+            raise ValueError("Матриця повинна бути квадратною!")
+
+        inv_row = np.asarray(circulant_inverse_row(row, modulus), dtype=np.int64)
+
+        row.setflags(write=False)
+        inv_row.setflags(write=False)
+
+        self.first_row = row
+        self.inverse_row = inv_row
+        self.modulus = modulus
+        self.size = row.size
+
+        self._matrix = None
+        self._inverse = None
+        self._det = None
+        self._fingerprint = None
+        self._spectra = {}
+
+    @classmethod
+    def from_parts(cls, first_row, modulus, inverse_row, det=None, fingerprint=None):
+        """
+        Створює циркулянтний ключ з першого рядка та першого рядка оберненої
+        без повторного обертання (наприклад, з файлу ключа). Елементи мають
+        бути вже зведені за модулем.
+
+        Args:
+            first_row: перший рядок матриці ключа
+            modulus: модуль (розмір алфавіту)
+            inverse_row: перший рядок оберненої матриці
+            det: детермінант за модулем (якщо відомий)
+            fingerprint: відбиток ключа (якщо відомий)
+        """
+        key = cls.__new__(cls)
+
+        row = np.asarray(first_row, dtype=np.int64).ravel()
+        inv_row = np.asarray(inverse_row, dtype=np.int64).ravel()
+        if row.size == 0 or row.shape != inv_row.shape:
+            raise ValueError("Розмір оберненої матриці не відповідає ключу")
+        row.setflags(write=False)
+        inv_row.setflags(write=False)
+
+        key.first_row = row
+        key.inverse_row = inv_row
+        key.modulus = modulus
+        key.size = row.size
+
+        key._matrix = None
+        key._inverse = None
+        key._det = det
+        key._fingerprint = fingerprint
+        key._spectra = {}
+        return key
+
+    @property
+    def has_inverse(self):
+        """Обернений циркулянт відомий з моменту створення ключа"""
+        return True
+
+    def __repr__(self):
+        return f"CirculantKey(size={self.size}, modulus={self.modulus}, fingerprint={self.fingerprint[:12]})"
+
+    @property
+    def matrix(self):
+        """Повна матриця ключа (будується при першому зверненні)"""
+        if self._matrix is None:
+            mat = CirculantMatrix(self.first_row.tolist()).to_numpy()
+            mat.setflags(write=False)
+            self._matrix = mat
+        return self._matrix
+
+    @property
+    def inverse(self):
+        """Повна обернена матриця (будується при першому зверненні)"""
+        if self._inverse is None:
+            inv = CirculantMatrix(self.inverse_row.tolist()).to_numpy()
+            inv.setflags(write=False)
+            self._inverse = inv
+        return self._inverse
+
+    @property
+    def det(self):
+        """Детермінант матриці ключа (обчислюється при першому зверненні)"""
+        if self._det is None:
+            _, self._det, _ = validate_matrix_determinant_reversibility(self.matrix, self.modulus)
+        return self._det
+
+    @property
+    def known_det(self):
+        """Детермінант, якщо він уже обчислений або завантажений, інакше None (без обчислення)"""
+        return self._det
+
+    @property
+    def fingerprint(self):
+        """SHA-256 відбиток ключа, той самий, що й у HillKey для повної матриці"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            digest.update(f"{self.modulus}:{self.size}:".encode("ascii"))
+            row = np.ascontiguousarray(self.first_row, dtype="<i8")
+            for i in range(self.size):
+                digest.update(np.roll(row, i).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def tolist(self):
+        """Ключ як CirculantMatrix (list-подібний, без побудови повної матриці)"""
+        return CirculantMatrix(self.first_row.tolist())
+
+    def _use_fft(self):
+        return self.size >= _FFT_MIN_SIZE and self.size * (self.modulus - 1) ** 2 < _FFT_EXACT_LIMIT
+
+    def _correlate(self, blocks, row, name):
+        """
+        Циклічна кореляція кожного блоку з рядком циркулянта через FFT:
+        out[i] = sum_k row[k] * v[(i + k) % n], тобто C · v.
+        """
+        n = self.size
+        spectrum = self._spectra.get(name)
+        if spectrum is None:
+            spectrum = np.conj(np.fft.rfft(row.astype(np.float64)))
+            self._spectra[name] = spectrum
+
+        product = np.fft.irfft(np.fft.rfft(blocks, axis=1) * spectrum, n=n, axis=1)
+        return np.mod(np.rint(product).astype(np.int64), self.modulus)
+
+    def encrypt_blocks(self, blocks):
+        """Множить усі блоки на циркулянтну матрицю ключа"""
+        if not self._use_fft():
+            return super().encrypt_blocks(blocks)
+        return self._correlate(np.asarray(blocks, dtype=np.int64), self.first_row, "key")
+
+    def decrypt_blocks(self, blocks, rows=None):
+        """Множить усі блоки на обернений циркулянт (перші rows елементів блоку)"""
+        if not self._use_fft():
+            return super().decrypt_blocks(blocks, rows)
+        result = self._correlate(np.asarray(blocks, dtype=np.int64), self.inverse_row, "inverse")
+        return result if rows is None else result[:, :rows]
+
+
+def as_hill_key(key_matrix, modulus):
+    """
+    Повертає скомпільований ключ для матриці.
+    Якщо передано HillKey, він використовується без повторної перевірки,
+    для CirculantMatrix створюється CirculantKey.
+
+    Args:
+        key_matrix: матриця або HillKey
+        modulus: модуль (розмір алфавіту)
+
+    Returns:
+        HillKey: ключ для заданого модуля
+    """
+    if isinstance(key_matrix, HillKey):
+        if key_matrix.modulus != modulus:
+            raise ValueError(
+                f"Ключ створено для модуля {key_matrix.modulus}, "
+                f"а розмір алфавіту {modulus}."
+            )
+        return key_matrix
+
+    if isinstance(key_matrix, CirculantMatrix):
+        return CirculantKey(key_matrix.first_row, modulus)
+
+    return HillKey(key_matrix, modulus)
+
+
+def _random_units(count, modulus):
+    """count випадкових оборотних за модулем чисел (взаємно простих з modulus)"""
+    units = np.zeros(0, dtype=np.int64)
+    while len(units) < count:
+        draw = secure_residues(2 * (count - len(units)) + 8, modulus)
+        units = np.concatenate([units, draw[np.gcd(draw, modulus) == 1]])
+    return units[:count]
+
+
+def _unit_triangular_inverse(tri, modulus, lower):
+    """Обернена до унітрикутної матриці (одиниці на діагоналі) підстановкою - O(n³)"""
+    n = tri.shape[0]
+    inv = np.eye(n, dtype=np.int64)
+    order = range(n) if lower else range(n - 1, -1, -1)
+
+    for i in order:
+        # Рядок i: inv[i] = e_i - sum_j tri[i, j] * inv[j] по вже обчислених j
+        others = slice(0, i) if lower else slice(i + 1, n)
+        inv[i] = np.mod(inv[i] - tri[i, others] @ inv[others], modulus)
+
+    return inv
+
+
+def generate_hill_key(size, modulus):
+    """
+    Генерує випадковий оборотний ключ разом з оберненим.
+
+    Ключ будується як добуток K = P · L · D · U, де P - випадкова
+    перестановка, L і U - випадкові нижня і верхня унітрикутні матриці,
+    D - діагональ з випадкових оборотних за модулем чисел. Кожен множник
+    оборотний для будь-якого модуля, тому генерація ніколи не відкидає
+    ключі, а обернена K^(-1) = U^(-1) · D^(-1) · L^(-1) · P^T та
+    детермінант det K = sign(P) · prod(D) отримуються з множників.
+    Для випадковості використовується криптографічно стійкий генератор.
+
+    Args:
+        size: розмір матриці
+        modulus: модуль (розмір алфавіту)
+
+    Returns:
+        HillKey: ключ з уже обчисленою оберненою матрицею
+    """
+    if size < 1:
+        raise ValueError("Розмір матриці має бути >= 1")
+    if modulus < 2:
+        raise ValueError("Модуль має бути >= 2")
+
+    n = size
+    below = np.tril_indices(n, -1)
+    above = np.triu_indices(n, 1)
+
+    lower = np.eye(n, dtype=np.int64)
+    lower[below] = secure_residues(len(below[0]), modulus)
+    upper = np.eye(n, dtype=np.int64)
+    upper[above] = secure_residues(len(above[0]), modulus)
+
+    diag = _random_units(n, modulus)
+    diag_inv = np.array([pow(int(d), -1, modulus) for d in diag], dtype=np.int64)
+
+    perm = list(range(n))
+    secrets.SystemRandom().shuffle(perm)
+    perm = np.array(perm, dtype=np.int64)
+
+    # P · X переставляє рядки: рядок i добутку - рядок perm[i] матриці X
+    ldu = np.mod(lower @ (diag[:, None] * upper), modulus)
+    matrix = ldu[perm]
+
+    lower_inv = _unit_triangular_inverse(lower, modulus, lower=True)
+    upper_inv = _unit_triangular_inverse(upper, modulus, lower=False)
+    ldu_inv = np.mod(upper_inv @ (diag_inv[:, None] * lower_inv), modulus)
+
+    # (P · X)^(-1) = X^(-1) · P^T: стовпець i оберненої - стовпець perm[i] X^(-1)
+    inverse = ldu_inv[:, perm]
+
+    # Знак перестановки: (-1)^(n - кількість циклів)
+    cycles = len(substitution_cycles(perm.tolist()))
+
+    det = 1
+    for d in diag.tolist():
+        det = det * d % modulus
+    if (n - cycles) % 2:
+        det = (-det) % modulus
+
+    return HillKey.from_parts(matrix, modulus, inverse, det)
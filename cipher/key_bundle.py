@@ -0,0 +1,282 @@
+"""
+Пакет ключа: алфавіт, матриця, обернена матриця та таблиці підстановки в одному файлі
+"""
+
+import hashlib
+import json
+import os
+import struct
+import numpy as np
+from .alphabet_codec import get_alphabet_codec
+from .hill_key import CirculantKey, HillKey, as_hill_key
+from .substitution import SubstitutionPowers, as_substitution_powers
+from utils.math_utils import CirculantMatrix, verify_inverse_mod
+
+# Сигнатура та версія формату
+BUNDLE_MAGIC = b"HILLKEY\x00"
+BUNDLE_VERSION = 1
+
+# Вирівнювання секцій даних (для відображення файлу в пам'ять)
+_ALIGNMENT = 64
+
+# Після сигнатури - довжина JSON заголовка (uint32, little-endian)
+_PREFIX = struct.Struct("<8sI")
+
+
+def _align(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _checksum(sections):
+    """SHA-256 вмісту секцій у порядку їх розміщення"""
+    digest = hashlib.sha256()
+    for data in sections:
+        digest.update(data.tobytes())
+    return digest.hexdigest()
+
+
+class KeyBundle:
+    """
+    Завантажений пакет ключа.
+
+    Масиви секцій - представлення (numpy.frombuffer) прочитаного в пам'ять
+    файлу: нічого не розбирається і не перераховується, обернена матриця
+    лише перевіряється за O(n²). Файл не залишається відкритим, тому його
+    можна одразу перезаписати.
+
+    Attributes:
+        alphabet: алфавіт (str)
+        modulus: розмір алфавіту
+        key: HillKey або CirculantKey з уже відомою оберненою матрицею
+        substitution: підстановка (numpy array) або None
+        inverse_substitution: обернена підстановка (numpy array) або None
+        powers: SubstitutionPowers з готовою цикловою структурою або None
+        fingerprint: відбиток ключа
+    """
+
+    def __init__(self, header, arrays):
+        self.header = header
+        self.arrays = arrays
+
+        self.modulus = header["modulus"]
+        self.fingerprint = header["fingerprint"]
+        self.alphabet = arrays["alphabet"].tobytes().decode("utf-32-le", "surrogatepass")
+
+        if header["kind"] == "circulant":
+            self.key = CirculantKey.from_parts(
+                arrays["key"], self.modulus, arrays["inverse"],
+                det=header.get("det"), fingerprint=self.fingerprint
+            )
+        else:
+            self.key = HillKey.from_parts(
+                arrays["key"], self.modulus, arrays["inverse"],
+                det=header.get("det"), fingerprint=self.fingerprint
+            )
+
+        if "substitution" in arrays:
+            self.substitution = arrays["substitution"]
+            self.inverse_substitution = arrays["inverse_substitution"]
+            self.powers = SubstitutionPowers.from_tables(
+                arrays["cycle_elements"], arrays["cycle_lengths"]
+            )
+        else:
+            self.substitution = None
+            self.inverse_substitution = None
+            self.powers = None
+
+    @property
+    def codec(self):
+        """Кодек алфавіту пакета"""
+        return get_alphabet_codec(self.alphabet)
+
+    def __repr__(self):
+        return (f"KeyBundle(kind={self.header['kind']}, size={self.key.size}, "
+                f"modulus={self.modulus}, fingerprint={self.fingerprint[:12]})")
+
+
+def save_key_bundle(path, alphabet, key_matrix, substitution=None):
+    """
+    Зберігає пакет ключа у бінарний файл.
+
+    Формат: сигнатура BUNDLE_MAGIC, довжина та JSON заголовок (параметри
+    ключа, опис секцій та SHA-256 їх вмісту), далі вирівняні секції
+    масивів little-endian:
+    alphabet (коди символів), key та inverse (для циркулянтного ключа -
+    тільки перші рядки), substitution, inverse_substitution та циклова
+    структура підстановки (cycle_elements, cycle_lengths).
+
+    Файл записується через тимчасовий файл і замінюється одним
+    os.replace, тому при помилці попередній пакет залишається цілим.
+
+    Args:
+        path: шлях до файлу
+        alphabet: алфавіт
+        key_matrix: матриця, CirculantMatrix або HillKey
+        substitution: підстановка або SubstitutionPowers (необов'язково)
+
+    Returns:
+        dict: заголовок збереженого пакета
+    """
+    modulus = len(alphabet)
+    key = as_hill_key(key_matrix, modulus)
+
+    sections = {
+        "alphabet": np.frombuffer(alphabet.encode("utf-32-le", "surrogatepass"), dtype="<u4")
+    }
+
+    if isinstance(key, CirculantKey):
+        kind = "circulant"
+        sections["key"] = key.first_row
+        sections["inverse"] = key.inverse_row
+        # Детермінант циркулянта потребує повної матриці - зберігаємо, лише якщо вже відомий
+        det = key.known_det
+    else:
+        kind = "dense"
+        sections["key"] = key.matrix
+        sections["inverse"] = key.inverse
+        det = key.det
+
+    if substitution is not None:
+        powers = as_substitution_powers(substitution)
+        if powers.size != modulus:
+            raise ValueError(
+                f"Розмір підстановки ({powers.size}) != розмір алфавіту ({modulus})."
+            )
+        forward = powers.apply(np.arange(modulus), 1)
+        sections["substitution"] = forward
+        sections["inverse_substitution"] = np.argsort(forward)
+        sections["cycle_elements"] = powers.cycle_elements
+        sections["cycle_lengths"] = powers.cycle_lengths
+
+    # Розміщення секцій
+    layout = {}
+    payload = []
+    offset = 0
+    for name, array in sections.items():
+        dtype = "<u4" if name == "alphabet" else "<i8"
+        data = np.ascontiguousarray(array, dtype=dtype)
+        offset = _align(offset)
+        layout[name] = {"offset": offset, "dtype": dtype, "shape": list(data.shape)}
+        payload.append((offset, data))
+        offset += data.nbytes
+
+    header = {
+        "version": BUNDLE_VERSION,
+        "kind": kind,
+        "modulus": modulus,
+        "size": key.size,
+        "det": None if det is None else int(det),
+        "fingerprint": key.fingerprint,
+        "sections": layout,
+        "checksum": _checksum(data for _, data in payload),
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header_bytes))
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_PREFIX.pack(BUNDLE_MAGIC, len(header_bytes)))
+            f.write(header_bytes)
+            for section_offset, data in payload:
+                f.seek(data_start + section_offset)
+                f.write(data.tobytes())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    return header
+
+
+def _verify_sections(header, arrays):
+    """
+    Перевіряє узгодженість секцій пакета: відбиток ключа, обернену матрицю
+    (verify_inverse_mod) та підстановку з її оберненою і цикловою структурою.
+
+    Raises:
+        ValueError: якщо дані пакета не узгоджені між собою
+    """
+    modulus = header["modulus"]
+
+    if header["kind"] == "circulant":
+        key = CirculantKey.from_parts(arrays["key"], modulus, arrays["inverse"])
+        valid = verify_inverse_mod(
+            CirculantMatrix(arrays["key"]), CirculantMatrix(arrays["inverse"]), modulus
+        )
+    else:
+        key = HillKey.from_parts(arrays["key"], modulus, arrays["inverse"])
+        valid = verify_inverse_mod(arrays["key"], arrays["inverse"], modulus)
+
+    if key.fingerprint != header["fingerprint"]:
+        raise ValueError("Відбиток ключа в пакеті не відповідає матриці")
+    if not valid:
+        raise ValueError("Обернена матриця в пакеті ключа не відповідає ключу")
+
+    if "substitution" in arrays:
+        identity = np.arange(modulus)
+        substitution = arrays["substitution"]
+        if substitution.shape != (modulus,) or arrays["inverse_substitution"].shape != (modulus,):
+            raise ValueError("Розмір підстановки в пакеті не відповідає алфавіту")
+        if not np.array_equal(np.take(arrays["inverse_substitution"], substitution, mode="clip"), identity):
+            raise ValueError("Обернена підстановка в пакеті не відповідає підстановці")
+
+        powers = SubstitutionPowers.from_tables(arrays["cycle_elements"], arrays["cycle_lengths"])
+        if powers.size != modulus or not np.array_equal(powers.apply(identity, 1), substitution):
+            raise ValueError("Циклова структура в пакеті не відповідає підстановці")
+
+
+def load_key_bundle(path, verify=True):
+    """
+    Завантажує пакет ключа. Файл читається повністю (він невеликий) і
+    закривається, секції - представлення прочитаних байтів без копіювання.
+
+    Args:
+        path: шлях до файлу
+        verify: перевірити відбиток ключа, збережену обернену матрицю
+            (verify_inverse_mod) та узгодженість таблиць підстановки
+
+    Returns:
+        KeyBundle
+
+    Raises:
+        ValueError: якщо файл не є пакетом ключа, має непідтримувану версію,
+            пошкоджений (контрольна сума) або його дані не узгоджені
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _PREFIX.size:
+        raise ValueError("Файл не є пакетом ключа")
+    magic, header_length = _PREFIX.unpack_from(data)
+    if magic != BUNDLE_MAGIC:
+        raise ValueError("Файл не є пакетом ключа")
+    header = json.loads(data[_PREFIX.size:_PREFIX.size + header_length].decode("utf-8"))
+
+    if header.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"Непідтримувана версія пакета ключа: {header.get('version')}")
+
+    data_start = _align(_PREFIX.size + header_length)
+    arrays = {}
+    for name, spec in header["sections"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        count = int(np.prod(shape))
+        offset = data_start + spec["offset"]
+        if offset + count * dtype.itemsize > len(data):
+            raise ValueError("Пакет ключа пошкоджений: секція виходить за межі файлу")
+        arrays[name] = np.frombuffer(data, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+    if _checksum(arrays.values()) != header.get("checksum"):
+        raise ValueError("Пакет ключа пошкоджений: контрольна сума не збігається")
+
+    if len(arrays["alphabet"]) != header["modulus"]:
+        raise ValueError("Розмір алфавіту в пакеті не відповідає модулю")
+
+    if verify:
+        _verify_sections(header, arrays)
+
+    return KeyBundle(header, arrays)
\ No newline at end of file
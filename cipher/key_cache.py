@@ -0,0 +1,219 @@
+"""
+Кеш обернених матриць ключів на диску
+"""
+
+import hashlib
+import io
+import os
+import numpy as np
+from config import KEY_CACHE_DIR, KEY_CACHE_MAX_BYTES, KEY_CACHE_ENABLED
+from utils.math_utils import verify_inverse_mod
+from .hill_key import CirculantKey
+
+# Розширення файлів записів кешу
+_ENTRY_SUFFIX = ".npz"
+
+
+def _checksum(fingerprint, modulus, inverse, det):
+    """Контрольна сума запису: відбиток ключа, модуль, детермінант та обернена матриця"""
+    digest = hashlib.sha256()
+    digest.update(f"{fingerprint}:{modulus}:{det}:".encode("ascii"))
+    digest.update(np.ascontiguousarray(inverse, dtype="<i8").tobytes())
+    return digest.hexdigest()
+
+
+class InverseCache:
+    """
+    Кеш обернених матриць на диску, адресований відбитком ключа.
+
+    Кожен запис - окремий файл <fingerprint>.npz з оберненою матрицею,
+    модулем, детермінантом та контрольною сумою. Запис, який не проходить
+    перевірку (пошкоджений файл, інший ключ, невірна сума або обернена,
+    що не проходить перевірку Фрейвалдса), видаляється і вважається
+    відсутнім. Час модифікації файлу оновлюється при кожному
+    зверненні, тому при перевищенні max_bytes видаляються записи, які
+    найдовше не використовувались (LRU).
+    """
+
+    def __init__(self, directory=KEY_CACHE_DIR, max_bytes=KEY_CACHE_MAX_BYTES):
+        """
+        Args:
+            directory: каталог кешу (створюється при першому записі)
+            max_bytes: максимальний сумарний розмір записів
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path_for(self, fingerprint):
+        """Шлях до файлу запису для відбитка ключа"""
+        return os.path.join(self.directory, fingerprint + _ENTRY_SUFFIX)
+
+    def _entries(self):
+        """Список (mtime, size, path) усіх записів кешу"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+
+        entries = []
+        for name in names:
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, key):
+        """
+        Завантажує обернену матрицю ключа з кешу.
+
+        Args:
+            key: HillKey
+
+        Returns:
+            bool: True, якщо обернена знайдена, пройшла перевірку та встановлена в ключ
+        """
+        fingerprint = key.fingerprint
+        path = self.path_for(fingerprint)
+        if not os.path.exists(path):
+            return False
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                inverse = data["inverse"]
+                modulus = int(data["modulus"])
+                det = int(data["det"])
+                stored_fingerprint = str(data["fingerprint"])
+                checksum = str(data["checksum"])
+        except Exception:
+            self._discard(path)
+            return False
+
+        valid = (
+            stored_fingerprint == fingerprint
+            and modulus == key.modulus
+            and inverse.shape == (key.size, key.size)
+            and checksum == _checksum(fingerprint, modulus, inverse, det)
+            and verify_inverse_mod(key.matrix, inverse, modulus)
+        )
+        if not valid:
+            self._discard(path)
+            return False
+
+        key.attach_inverse(inverse)
+
+        # Оновлюємо час використання запису для LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True
+
+    def put(self, key):
+        """
+        Зберігає обернену матрицю ключа в кеш (обчислює її, якщо потрібно).
+
+        Args:
+            key: HillKey
+        """
+        fingerprint = key.fingerprint
+        inverse = np.ascontiguousarray(key.inverse, dtype=np.int64)
+        det = -1 if key.det is None else int(key.det)
+
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            inverse=inverse,
+            modulus=np.int64(key.modulus),
+            det=np.int64(det),
+            fingerprint=np.str_(fingerprint),
+            checksum=np.str_(_checksum(fingerprint, key.modulus, inverse, det))
+        )
+
+        path = self.path_for(fingerprint)
+        # Запис через тимчасовий файл, щоб інший процес не прочитав неповний запис
+        temp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(buffer.getvalue())
+            os.replace(temp_path, path)
+        except OSError:
+            # Неповний тимчасовий файл не повинен залишатися в каталозі кешу
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        self.evict()
+
+    def evict(self):
+        """Видаляє записи, що найдовше не використовувались, поки кеш більший за max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+
+    def clear(self):
+        """Видаляє всі записи кешу"""
+        for _, _, path in self._entries():
+            self._discard(path)
+
+    def ensure_inverse(self, key):
+        """
+        Забезпечує ключ оберненою матрицею: з кешу, а якщо її там немає -
+        обчислює та зберігає в кеш.
+
+        Циркулянтні ключі обертаються за O(n²) при створенні, тому кеш
+        для них не використовується.
+
+        Args:
+            key: HillKey
+
+        Returns:
+            HillKey: той самий ключ
+        """
+        if isinstance(key, CirculantKey) or key.has_inverse:
+            return key
+
+        if not self.get(key):
+            self.put(key)
+        return key
+
+
+_default_cache = None
+
+
+def get_key_cache(enabled=None):
+    """
+    Кеш з параметрами з config.py (KEY_CACHE_DIR, KEY_CACHE_MAX_BYTES)
+    або None, якщо кеш вимкнено
+
+    Args:
+        enabled: чи використовувати кеш (None - значення KEY_CACHE_ENABLED);
+            вікно розшифрування передає стан перемикача
+    """
+    global _default_cache
+    if enabled is None:
+        enabled = KEY_CACHE_ENABLED
+    if not enabled:
+        return None
+    if _default_cache is None:
+        _default_cache = InverseCache()
+    return _default_cache
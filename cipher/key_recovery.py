@@ -0,0 +1,316 @@
+"""
+Відновлення ключа Хілла за відомим відкритим текстом
+"""
+
+import numpy as np
+from utils.math_utils import (
+    solve_linear_mod,
+    matrix_mod_inverse,
+    batch_matrix_mod_inverse,
+    factorize,
+    crt_combine
+)
+from .hill_cipher import text_to_numbers
+from .hill_key import HillKey
+
+
+def recover_key(plain_blocks, cipher_blocks, modulus):
+    """
+    Відновлює ключ за парами блоків відкритого та шифрованого тексту.
+
+    Шифрування блоку - c = K · p (mod m), тобто для масивів блоків
+    C = P · Kᵀ і P = C · (K⁻¹)ᵀ. Невідома (K⁻¹)ᵀ знаходиться розв'язком
+    лінійної системи C · X ≡ P (mod m) (solve_linear_mod): за модулем
+    кожного степеня простого з усіх блоків вибираються n лінійно
+    незалежних, решта блоків лише перевіряють сумісність. Складність
+    O(N · n²) замість перебору m^(n²) матриць.
+
+    Args:
+        plain_blocks: блоки відкритого тексту (N × n), N >= n
+        cipher_blocks: відповідні блоки шифрованого тексту (N × n)
+        modulus: модуль (розмір алфавіту)
+
+    Returns:
+        HillKey: ключ з уже відомою оберненою матрицею
+
+    Raises:
+        ValueError: якщо блоків недостатньо (ранг менший за n) або
+            відкритий текст не відповідає жодному ключу
+    """
+    plain = np.mod(np.asarray(plain_blocks, dtype=np.int64), modulus)
+    cipher = np.mod(np.asarray(cipher_blocks, dtype=np.int64), modulus)
+
+    if plain.ndim != 2 or plain.shape != cipher.shape:
+        raise ValueError("Блоки відкритого та шифрованого тексту мають різну форму")
+
+    n = plain.shape[1]
+    if plain.shape[0] < n:
+        raise ValueError(f"Потрібно щонайменше {n} блоків відомого тексту, отримано {plain.shape[0]}")
+
+    inverse = np.ascontiguousarray(solve_linear_mod(cipher, plain, modulus).T)
+
+    # Обернена до K⁻¹ - сам ключ; якщо K⁻¹ не оборотна, ключа не існує
+    key_matrix = np.asarray(matrix_mod_inverse(inverse, modulus, show_progress=False), dtype=np.int64)
+
+    return HillKey.from_parts(key_matrix, modulus, inverse)
+
+
+def recover_key_from_text(plaintext, ciphertext, alph, matrix_size):
+    """
+    Відновлює ключ стандартного шифру Хілла за відомим початком відкритого
+    тексту. Використовуються всі повні блоки, для яких відомі обидва тексти.
+
+    Args:
+        plaintext: відомий відкритий текст (або його початок)
+        ciphertext: шифрований текст
+        alph: алфавіт
+        matrix_size: розмір матриці ключа
+
+    Returns:
+        HillKey: відновлений ключ
+
+    Raises:
+        ValueError: якщо ключ не вдається відновити
+    """
+    plain = text_to_numbers(plaintext, alph)
+    cipher = text_to_numbers(ciphertext, alph)
+
+    block_count = min(len(plain), len(cipher)) // matrix_size
+    length = block_count * matrix_size
+
+    return recover_key(
+        np.reshape(plain[:length], (block_count, matrix_size)),
+        np.reshape(cipher[:length], (block_count, matrix_size)),
+        len(alph)
+    )
+
+
+def inverse_row_candidates(start, stop, size, modulus):
+    """
+    Рядки з номерами start..stop-1 у переліку всіх m^n рядків довжини n
+    (цифри номера в системі числення з основою m)
+
+    Returns:
+        numpy array: масив форми (stop - start, size)
+    """
+    index = np.arange(start, stop, dtype=np.int64)[:, None]
+    return (index // modulus ** np.arange(size, dtype=np.int64)) % modulus
+
+
+def _score_dtype(size, modulus):
+    """Найменший знаковий тип, у якому скалярний добуток рядка на блок не переповнюється"""
+    bound = size * (modulus - 1) ** 2
+    if bound < 2 ** 15:
+        return np.int16
+    if bound < 2 ** 31:
+        return np.int32
+    return np.int64
+
+
+def _best_row_combinations(best_scores, best_rows, modulus, limit):
+    """
+    Оборотні матриці з найкращих рядків для кожної позиції,
+    від найбільшої сумарної кількості збігів (спільно для InverseRowSearch
+    та CrtInverseRowSearch)
+    """
+    size, keep = best_scores.shape
+    while keep > 1 and keep ** size > limit:
+        keep -= 1
+    if keep == 0:
+        return
+
+    # Усі комбінації індексів рядків: keep^n варіантів
+    choice = np.indices((keep,) * size).reshape(size, -1).T
+    positions = np.arange(size)
+    totals = best_scores[positions, choice].sum(axis=1)
+    order = np.argsort(-totals, kind="stable")
+
+    matrices = best_rows[positions, choice[order]]
+    keys, mask = batch_matrix_mod_inverse(matrices, modulus)
+
+    for inverse, key_matrix, score in zip(matrices[mask], keys[mask], totals[order][mask]):
+        yield inverse, key_matrix, int(score)
+
+
+class InverseRowSearch:
+    """
+    Перебір оберненої матриці по рядках.
+
+    Рядок i матриці K⁻¹ визначає i-й символ кожного блоку відкритого
+    тексту незалежно від інших рядків: p[b, i] = K⁻¹[i] · c[b]. Тому кожен
+    з m^n можливих рядків оцінюється один раз (кількість збігів з відомим
+    текстом на позиції i) для всіх позицій одночасно, і для кожної позиції
+    зберігаються top_k найкращих рядків. Замість m^(n²) матриць
+    перевіряється m^n рядків, а потім top_k^n комбінацій найкращих рядків.
+    Обчислення ведуться в найменшому цілому типі, достатньому для модуля.
+    """
+
+    # Кількість передбачених символів (рядки × блоки), що оцінюються за один пакет
+    _SCORE_ELEMENTS = 1 << 22
+
+    def __init__(self, cipher_blocks, plain_blocks, modulus, top_k=4):
+        """
+        Args:
+            cipher_blocks: блоки шифрованого тексту з відомим відкритим текстом (N × n)
+            plain_blocks: відповідні блоки відкритого тексту (N × n)
+            modulus: модуль (розмір алфавіту)
+            top_k: кількість найкращих рядків, що зберігаються для кожної позиції
+        """
+        cipher_blocks = np.asarray(cipher_blocks, dtype=np.int64)
+        plain_blocks = np.asarray(plain_blocks, dtype=np.int64)
+        if cipher_blocks.ndim != 2 or cipher_blocks.shape != plain_blocks.shape:
+            raise ValueError("Блоки відкритого та шифрованого тексту мають різну форму")
+        if len(cipher_blocks) == 0:
+            raise ValueError("Немає блоків відомого тексту")
+
+        self.modulus = modulus
+        self.size = cipher_blocks.shape[1]
+        self.top_k = top_k
+        self.total = modulus ** self.size
+        self.batch_size = max(1, self._SCORE_ELEMENTS // len(cipher_blocks))
+
+        self._dtype = _score_dtype(self.size, modulus)
+        self.cipher_blocks = np.mod(cipher_blocks, modulus).astype(self._dtype)
+        self.plain_blocks = np.mod(plain_blocks, modulus).astype(self._dtype)
+
+        self.best_scores = np.zeros((self.size, 0), dtype=np.int64)
+        self.best_rows = np.zeros((self.size, 0, self.size), dtype=np.int64)
+
+    def batches(self):
+        """Межі пакетів (start, stop) переліку рядків"""
+        for start in range(0, self.total, self.batch_size):
+            yield start, min(start + self.batch_size, self.total)
+
+    def update(self, start, stop):
+        """Оцінює рядки з номерами start..stop-1 та оновлює найкращі для кожної позиції"""
+        candidates = inverse_row_candidates(start, stop, self.size, self.modulus)
+        predicted = np.mod(candidates.astype(self._dtype) @ self.cipher_blocks.T, self.modulus)
+
+        keep = min(self.top_k, self.best_scores.shape[1] + len(candidates))
+        best_scores = np.empty((self.size, keep), dtype=np.int64)
+        best_rows = np.empty((self.size, keep, self.size), dtype=np.int64)
+
+        for i in range(self.size):
+            scores = (predicted == self.plain_blocks[:, i]).sum(axis=1)
+
+            # Попередні найкращі + новий пакет -> keep найкращих
+            merged_scores = np.concatenate([self.best_scores[i], scores])
+            top = np.argpartition(-merged_scores, keep - 1)[:keep]
+            top = top[np.argsort(-merged_scores[top], kind="stable")]
+
+            best_scores[i] = merged_scores[top]
+            best_rows[i] = np.concatenate([self.best_rows[i], candidates])[top]
+
+        self.best_scores = best_scores
+        self.best_rows = best_rows
+
+    def combinations(self, limit=4096):
+        """
+        Оборотні матриці з найкращих рядків, від найбільшої сумарної кількості збігів
+
+        Args:
+            limit: максимальна кількість комбінацій (для великих n на кожній
+                   позиції береться менше найкращих рядків)
+
+        Yields:
+            tuple: (inverse, key_matrix, score) - кандидат K⁻¹, відповідний ключ та кількість збігів
+        """
+        return _best_row_combinations(self.best_scores, self.best_rows, self.modulus, limit)
+
+
+class CrtInverseRowSearch:
+    """
+    Перебір по рядках з розкладом модуля за китайською теоремою про остачі.
+
+    Ключ за модулем m = p1^e1 · p2^e2 · ... - це набір незалежних ключів за
+    модулями pi^ei, тому рядки оберненої матриці шукаються окремо для
+    кожної компоненти (InverseRowSearch з відомим текстом, зведеним за
+    модулем pi^ei): замість m^n перевіряється сума (pi^ei)^n рядків,
+    у малих цілих типах. Найкращі рядки компонент для кожної позиції
+    об'єднуються через КТО, оцінюються за повним модулем, і з top_k
+    найкращих складаються матриці, як у InverseRowSearch.
+    """
+
+    # Для малих компонент (2, 3, ...) випадкові рядки часто мають стільки ж
+    # збігів, скільки справжній, тому кожна компонента зберігає більше рядків
+    _COMPONENT_TOP_K = 16
+
+    def __init__(self, cipher_blocks, plain_blocks, modulus, top_k=4):
+        """
+        Args:
+            cipher_blocks: блоки шифрованого тексту з відомим відкритим текстом (N × n)
+            plain_blocks: відповідні блоки відкритого тексту (N × n)
+            modulus: модуль (розмір алфавіту)
+            top_k: кількість найкращих рядків, що зберігаються для кожної позиції
+        """
+        self.cipher_blocks = np.mod(np.asarray(cipher_blocks, dtype=np.int64), modulus)
+        self.plain_blocks = np.mod(np.asarray(plain_blocks, dtype=np.int64), modulus)
+        self.modulus = modulus
+        self.top_k = top_k
+
+        self.components = [
+            InverseRowSearch(self.cipher_blocks, self.plain_blocks, p ** e, max(top_k, self._COMPONENT_TOP_K))
+            for p, e in factorize(modulus)
+        ]
+        self.size = self.components[0].size
+        self.total = sum(component.total for component in self.components)
+
+    def batches(self):
+        """
+        Пакети перебору всіх компонент
+
+        Yields:
+            tuple: (component, start, stop) - InverseRowSearch компоненти та межі пакета
+        """
+        for component in self.components:
+            for start, stop in component.batches():
+                yield component, start, stop
+
+    def update(self, component, start, stop):
+        """Оцінює пакет рядків компоненти (component.update)"""
+        component.update(start, stop)
+
+    def best(self):
+        """
+        Найкращі рядки за повним модулем для кожної позиції: КТО-комбінації
+        найкращих рядків компонент, оцінені за відомим текстом
+
+        Returns:
+            tuple: (best_scores, best_rows) форм (n × k) та (n × k × n)
+        """
+        moduli = [component.modulus for component in self.components]
+        keep_per_component = [component.best_scores.shape[1] for component in self.components]
+
+        # Індекси рядків компонент для кожної комбінації
+        choice = np.indices(keep_per_component).reshape(len(moduli), -1).T
+        keep = min(self.top_k, len(choice))
+
+        best_scores = np.empty((self.size, keep), dtype=np.int64)
+        best_rows = np.empty((self.size, keep, self.size), dtype=np.int64)
+
+        for i in range(self.size):
+            rows = crt_combine(
+                [component.best_rows[i][choice[:, j]] for j, component in enumerate(self.components)],
+                moduli
+            )
+            predicted = np.mod(rows @ self.cipher_blocks.T, self.modulus)
+            scores = (predicted == self.plain_blocks[:, i]).sum(axis=1)
+
+            top = np.argsort(-scores, kind="stable")[:keep]
+            best_scores[i] = scores[top]
+            best_rows[i] = rows[top]
+
+        return best_scores, best_rows
+
+    def combinations(self, limit=4096):
+        """
+        Оборотні матриці за повним модулем, від найбільшої сумарної кількості збігів
+
+        Args:
+            limit: максимальна кількість комбінацій
+
+        Yields:
+            tuple: (inverse, key_matrix, score) - кандидат K⁻¹, відповідний ключ та кількість збігів
+        """
+        best_scores, best_rows = self.best()
+        return _best_row_combinations(best_scores, best_rows, self.modulus, limit)
@@ -0,0 +1,119 @@
+"""
+Генерація шуму для модифікованого шифрування Хілла
+"""
+
+import secrets
+import numpy as np
+
+# Ширина випадкового числа (в байтах) в залежності від модуля
+_RAW_DTYPES = {1: np.uint8, 2: np.dtype("<u2"), 4: np.dtype("<u4"), 8: np.dtype("<u8")}
+
+
+def secure_residues(count, modulus):
+    """
+    Генерує count рівномірно розподілених чисел з [0, modulus)
+    криптографічно стійким генератором.
+
+    Ентропія береться одним буфером через secrets.token_bytes, а не окремим
+    викликом на кожне число. Сирі значення, які потрапляють у неповний
+    останній інтервал довжини modulus, відкидаються (rejection sampling),
+    тому результат не має зміщення за модулем.
+
+    Args:
+        count: кількість чисел
+        modulus: модуль (розмір алфавіту)
+
+    Returns:
+        numpy array: масив int64 довжини count
+    """
+    if modulus < 1:
+        raise ValueError("Модуль має бути >= 1")
+
+    result = np.zeros(max(count, 0), dtype=np.int64)
+    if count <= 0 or modulus == 1:
+        return result
+
+    width = next(w for w in (1, 2, 4, 8) if modulus <= 256 ** w)
+    dtype = _RAW_DTYPES[width]
+
+    space = 256 ** width
+    limit = space - space % modulus  # приймаємо тільки значення < limit
+    acceptance = limit / space
+
+    filled = 0
+    while filled < count:
+        need = count - filled
+        draw = int(need / acceptance * 1.1) + 16
+
+        raw = np.frombuffer(secrets.token_bytes(draw * width), dtype=dtype)
+        if limit < space:
+            raw = raw[raw < limit]
+
+        take = min(need, len(raw))
+        result[filled:filled + take] = raw[:take].astype(np.uint64) % np.uint64(modulus)
+        filled += take
+
+    return result
+
+
+class SecureNoise:
+    """
+    Шум з криптографічно стійкого генератора (поведінка за замовчуванням).
+    Кожен виклик дає нові випадкові значення, номер блоку не враховується.
+    """
+
+    def blocks(self, first_block, block_count, noise_length, modulus):
+        """
+        Генерує шум для блоків first_block .. first_block + block_count - 1
+
+        Returns:
+            numpy array: масив форми (block_count, noise_length)
+        """
+        return secure_residues(block_count * noise_length, modulus).reshape(block_count, noise_length)
+
+
+class CounterNoise:
+    """
+    Відтворюваний шум на основі лічильникового генератора Philox.
+
+    Генератор ключується nonce повідомлення, а шум блоку k береться з
+    позиції k * noise_length потоку Philox, на яку генератор переходить
+    за O(1). Тому будь-який діапазон блоків можна згенерувати незалежно:
+    частини тексту шифруються паралельно або в довільному порядку, а з тим
+    самим nonce результат повністю відтворюється (наприклад, для тестів
+    продуктивності).
+
+    Philox не є криптографічно стійким генератором; для звичайного
+    шифрування використовується SecureNoise. Зміщення від зведення 64-бітних
+    значень за модулем не перевищує modulus / 2^64.
+    """
+
+    def __init__(self, nonce=None):
+        """
+        Args:
+            nonce: 128-бітний ключ генератора (за замовчуванням - випадковий)
+        """
+        if nonce is None:
+            nonce = secrets.randbits(128)
+        self.nonce = int(nonce) % (1 << 128)
+
+    def blocks(self, first_block, block_count, noise_length, modulus):
+        """
+        Генерує шум для блоків first_block .. first_block + block_count - 1
+
+        Returns:
+            numpy array: масив форми (block_count, noise_length)
+        """
+        count = block_count * noise_length
+        if count <= 0:
+            return np.zeros((block_count, noise_length), dtype=np.int64)
+
+        # Кожен крок лічильника Philox дає 4 64-бітних значення
+        start = first_block * noise_length
+        bit_generator = np.random.Philox(key=self.nonce)
+        bit_generator.advance(start // 4)
+
+        raw = bit_generator.random_raw(start % 4 + count)[start % 4:]
+        residues = (raw % np.uint64(modulus)).astype(np.int64)
+
+        return residues.reshape(block_count, noise_length)
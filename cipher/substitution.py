@@ -2,7 +2,69 @@
 Модуль для роботи з підстановками
 """
 
+import bisect
+import math
 import secrets
+import struct
+import zlib
+import numpy as np
+
+# Бінарний формат підстановки: сигнатура, версія, кодування, розмір,
+# CRC32 даних (little-endian), далі дані
+SUBSTITUTION_MAGIC = b"SUBST\x00"
+SUBSTITUTION_VERSION = 1
+_SUBST_HEADER = struct.Struct("<6sBBII")
+
+# Кодування даних: масив фіксованої ширини або код Лемера
+_ENCODING_ARRAY = 0
+_ENCODING_LEHMER = 1
+
+
+def _index_dtype(size):
+    """Найменший беззнаковий тип, що вміщує індекси 0..size-1"""
+    if size <= 2 ** 8:
+        return np.uint8
+    if size <= 2 ** 16:
+        return np.uint16
+    return np.uint32
+
+
+def generate_random_substitutions(count, size):
+    """
+    Генерує count випадкових підстановок розміру size одним масивом
+
+    Кожному елементу кожного рядка призначається випадковий 64-бітний ключ
+    з криптографічно стійкого генератора (одним буфером secrets.token_bytes),
+    і підстановка - це порядок сортування ключів (argsort по рядках). Рядки,
+    де ключі збіглися, генеруються заново, тому всі підстановки рівноймовірні.
+
+    Args:
+        count: Кількість підстановок
+        size: Розмір підстановки
+
+    Returns:
+        numpy array: Масив форми (count, size), рядки - підстановки
+    """
+    if count < 0 or size < 0:
+        raise ValueError("Кількість і розмір підстановок мають бути >= 0")
+
+    result = np.empty((count, size), dtype=_index_dtype(size))
+    pending = np.arange(count)
+
+    while len(pending):
+        keys = np.frombuffer(
+            secrets.token_bytes(len(pending) * size * 8), dtype="<u8"
+        ).reshape(len(pending), size)
+
+        order = np.argsort(keys, axis=1)
+        sorted_keys = np.take_along_axis(keys, order, axis=1)
+        ties = (sorted_keys[:, 1:] == sorted_keys[:, :-1]).any(axis=1)
+
+        accepted = ~ties
+        result[pending[accepted]] = order[accepted]
+        pending = pending[ties]
+
+    return result
 
 
 def generate_random_substitution(size):
@@ -15,14 +77,7 @@ def generate_random_substitution(size):
     Returns:
         list: Випадкова підстановка
     """
-    numbers = list(range(size))
-
-    # Алгоритм Fisher-Yates для безпечного перемішування
-    for i in reversed(range(1, size)):
-        j = secrets.randbelow(i + 1)
-        numbers[i], numbers[j] = numbers[j], numbers[i]
-
-    return numbers
+    return generate_random_substitutions(1, size)[0].tolist()
 
 
 def create_shift_substitution(size, shift=1):
@@ -61,8 +116,11 @@ def invert_substitution(substitution):
         substitution: Вихідна підстановка
 
     Returns:
-        list: Обернена підстановка
+        list: Обернена підстановка (Permutation для Permutation)
     """
+    if isinstance(substitution, Permutation):
+        return substitution.inverse
+
     n = len(substitution)
     inverse = [0] * n
 
@@ -83,9 +141,34 @@ def validate_substitution(substitution, expected_size=None):
     Returns:
         tuple: (is_valid, error_message)
     """
-    if not substitution:
+    if substitution is None or len(substitution) == 0:
         return False, "Підстановка порожня"
 
+    if isinstance(substitution, Permutation):
+        # Коректність перевірена при створенні
+        if expected_size is not None and substitution.size != expected_size:
+            return False, f"Розмір підстановки ({substitution.size}) не відповідає очікуваному ({expected_size})"
+        return True, "Підстановка коректна"
+
+    if isinstance(substitution, np.ndarray):
+        # Рядок з generate_random_substitutions - ті ж перевірки векторизовано
+        if substitution.ndim != 1 or not np.issubdtype(substitution.dtype, np.integer):
+            return False, "Підстановка має бути одновимірним масивом цілих чисел"
+
+        size = substitution.size
+        if expected_size is not None and size != expected_size:
+            return False, f"Розмір підстановки ({size}) не відповідає очікуваному ({expected_size})"
+
+        if len(np.unique(substitution)) != size:
+            return False, "Підстановка містить дублікати"
+
+        out_of_range = np.flatnonzero((substitution < 0) | (substitution >= size))
+        if len(out_of_range):
+            val = int(substitution[out_of_range[0]])
+            return False, f"Значення {val} виходить за межі діапазону [0, {size - 1}]"
+
+        return True, "Підстановка коректна"
+
     if not isinstance(substitution, (list, tuple)):
         return False, "Підстановка має бути списком або кортежем"
 
@@ -119,6 +202,8 @@ def apply_substitution(data, substitution):
     Returns:
         list: Дані після підстановки
     """
+    if isinstance(substitution, Permutation):
+        return substitution.apply(data).tolist()
     return [substitution[x % len(substitution)] for x in data]
 
 
@@ -134,10 +219,11 @@ def apply_substitution_multiple(data, substitution, times=1):
     Returns:
         list: Дані після багаторазової підстановки
     """
-    result = data.copy()
-    for _ in range(times):
-        result = apply_substitution(result, substitution)
-    return result
+    if times <= 0:
+        return list(data)
+
+    # σ^times обчислюється через розклад на цикли, а не times проходами
+    return as_substitution_powers(substitution).apply(data, times).tolist()
 
 
 def compose_substitutions(subst1, subst2):
@@ -149,14 +235,49 @@ def compose_substitutions(subst1, subst2):
         subst2: Друга підстановка
 
     Returns:
-        list: Композиція підстановок
+        list: Композиція підстановок (Permutation, якщо subst1 - Permutation)
     """
+    if isinstance(subst1, Permutation):
+        return subst1.compose(subst2)
+
     if len(subst1) != len(subst2):
         raise ValueError("Підстановки мають бути однакового розміру")
 
     return [subst1[subst2[i]] for i in range(len(subst1))]
 
 
+def substitution_cycles(substitution):
+    """
+    Розкладає підстановку на незалежні цикли
+
+    Args:
+        substitution: Підстановка
+
+    Returns:
+        list: Список циклів, кожен цикл - список елементів у порядку обходу
+    """
+    if isinstance(substitution, Permutation):
+        return [cycle[:] for cycle in substitution.cycles]
+
+    n = len(substitution)
+    visited = [False] * n
+    cycles = []
+
+    for i in range(n):
+        if not visited[i]:
+            cycle = []
+            current = i
+
+            while not visited[current]:
+                visited[current] = True
+                cycle.append(current)
+                current = substitution[current]
+
+            cycles.append(cycle)
+
+    return cycles
+
+
 def substitution_order(substitution):
     """
     Обчислює порядок підстановки (мінімальна кількість застосувань для повернення до початкового стану)
@@ -167,8 +288,9 @@ def substitution_order(substitution):
     Returns:
         int: Порядок підстановки
     """
-    n = len(substitution)
-    visited = [False] * n
+    if isinstance(substitution, Permutation):
+        return substitution.order
+
     lcm = 1
 
     def gcd(a, b):
@@ -179,20 +301,330 @@ def substitution_order(substitution):
     def lcm_func(a, b):
         return abs(a * b) // gcd(a, b)
 
-    # Знаходимо всі цикли
-    for i in range(n):
-        if not visited[i]:
-            cycle_length = 0
-            current = i
+    # Порядок - НСК довжин усіх циклів
+    for cycle in substitution_cycles(substitution):
+        lcm = lcm_func(lcm, len(cycle))
 
-            while not visited[current]:
-                visited[current] = True
-                current = substitution[current]
-                cycle_length += 1
+    return lcm
 
-            lcm = lcm_func(lcm, cycle_length)
 
-    return lcm
+class SubstitutionPowers:
+    """
+    Степені підстановки σ^k для довільного k без k послідовних застосувань.
+
+    Для кожного елемента x запам'ятовується цикл, якому він належить,
+    позиція в циклі та довжина циклу. Тоді σ^k(x) - це елемент того ж
+    циклу, зсунутий на k позицій (k за модулем довжини циклу), тобто
+    кожен степінь обчислюється за O(1) на елемент. Від'ємні k дають
+    степені оберненої підстановки.
+    """
+
+    def __init__(self, substitution):
+        """
+        Args:
+            substitution: Підстановка (перестановка чисел 0..n-1)
+
+        Raises:
+            ValueError: якщо підстановка не є перестановкою
+        """
+        size = len(substitution)
+        if size == 0:
+            raise ValueError("Підстановка порожня")
+
+        normalized = [int(x) % size for x in substitution]
+        if len(set(normalized)) != size:
+            raise ValueError("Підстановка містить дублікати")
+
+        self.cycles = substitution_cycles(normalized)
+        self._build_tables(
+            np.array([x for cycle in self.cycles for x in cycle], dtype=np.int64),
+            np.array([len(cycle) for cycle in self.cycles], dtype=np.int64)
+        )
+
+    @classmethod
+    def from_tables(cls, cycle_elements, cycle_lengths):
+        """
+        Створює об'єкт з готової циклової структури (наприклад, з файлу ключа)
+        без повторного розкладу підстановки на цикли.
+
+        Args:
+            cycle_elements: елементи всіх циклів підряд
+            cycle_lengths: довжини циклів
+
+        Raises:
+            ValueError: якщо таблиці не описують перестановку
+        """
+        flat = np.asarray(cycle_elements, dtype=np.int64)
+        lengths = np.asarray(cycle_lengths, dtype=np.int64)
+
+        size = len(flat)
+        if size == 0:
+            raise ValueError("Підстановка порожня")
+        if lengths.sum() != size or (lengths <= 0).any():
+            raise ValueError("Некоректна циклова структура підстановки")
+        if flat.min() < 0 or flat.max() >= size or np.bincount(flat, minlength=size).max() != 1:
+            raise ValueError("Підстановка містить дублікати")
+
+        engine = cls.__new__(cls)
+        engine.cycles = [cycle.tolist() for cycle in np.split(flat, np.cumsum(lengths)[:-1])]
+        engine._build_tables(flat, lengths)
+        return engine
+
+    def _build_tables(self, flat, lengths):
+        """
+        Таблиці для швидкого обчислення степенів: елементи всіх циклів
+        підряд і для кожного елемента - початок його циклу, позиція в
+        циклі та довжина циклу
+        """
+        size = len(flat)
+        cycle_starts = np.cumsum(lengths) - lengths
+        cycle_of = np.repeat(np.arange(len(lengths)), lengths)
+
+        start = np.empty(size, dtype=np.int64)
+        position = np.empty(size, dtype=np.int64)
+        length = np.empty(size, dtype=np.int64)
+
+        start[flat] = cycle_starts[cycle_of]
+        position[flat] = np.arange(size) - cycle_starts[cycle_of]
+        length[flat] = lengths[cycle_of]
+
+        # Порядок - НСК довжин усіх циклів
+        order = 1
+        for cycle_len in set(lengths.tolist()):
+            order = order * cycle_len // math.gcd(order, cycle_len)
+
+        self.size = size
+        self.order = order
+        self._flat = flat
+        self._lengths = lengths
+        self._start = start
+        self._position = position
+        self._length = length
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def cycle_elements(self):
+        """Елементи всіх циклів підряд (таблиця для from_tables)"""
+        return self._flat
+
+    @property
+    def cycle_lengths(self):
+        """Довжини циклів (таблиця для from_tables)"""
+        return self._lengths
+
+    def power(self, k):
+        """
+        Обчислює σ^k
+
+        Args:
+            k: Степінь (може бути від'ємним)
+
+        Returns:
+            list: Підстановка σ^k
+        """
+        return self.apply(np.arange(self.size), k).tolist()
+
+    def apply(self, values, k):
+        """
+        Застосовує σ^k до масиву значень
+
+        Args:
+            values: Список або numpy array чисел (беруться за модулем розміру)
+            k: Степінь або numpy array степенів, що транслюється на values
+
+        Returns:
+            numpy array: Значення після застосування σ^k
+        """
+        values = np.mod(np.asarray(values, dtype=np.int64), self.size)
+        length = self._length[values]
+
+        if np.isscalar(k):
+            k = int(k) % self.order
+            if k >= 2 ** 62:
+                # Порядок не вміщується в int64 - зводимо k за довжиною циклу кожного елемента
+                k = np.array([k % cycle_len for cycle_len in range(1, self.size + 1)], dtype=np.int64)[length - 1]
+        else:
+            k = np.asarray(k, dtype=np.int64)
+
+        return self._flat[self._start[values] + np.mod(self._position[values] + k, length)]
+
+
+class Permutation:
+    """
+    Підстановка, що зберігається компактним numpy масивом (uint8/uint16/uint32
+    залежно від розміру).
+
+    Обернена підстановка, розклад на цикли та порядок обчислюються при
+    першому зверненні і кешуються. Степінь σ^k будується за O(n), а
+    застосування до масиву значень векторизоване (через SubstitutionPowers).
+    Поводиться як list (len, індексування, ітерація, зрізи), тому може
+    передаватися всюди, де очікується підстановка-список.
+    """
+
+    def __init__(self, values):
+        """
+        Args:
+            values: Підстановка (послідовність чисел 0..n-1)
+
+        Raises:
+            ValueError: якщо підстановка порожня, містить значення поза
+                діапазоном [0, n-1] або дублікати
+        """
+        array = np.asarray(values, dtype=np.int64).ravel()
+        size = array.size
+        if size == 0:
+            raise ValueError("Підстановка порожня")
+
+        out_of_range = np.flatnonzero((array < 0) | (array >= size))
+        if len(out_of_range):
+            val = int(array[out_of_range[0]])
+            raise ValueError(f"Значення {val} виходить за межі діапазону [0, {size - 1}]")
+
+        if np.bincount(array, minlength=size).max() != 1:
+            raise ValueError("Підстановка містить дублікати")
+
+        self._init_array(array)
+
+    @classmethod
+    def _from_array(cls, array, copy=True):
+        """
+        Створення з масиву, який уже є перестановкою 0..n-1 (без перевірки).
+        При copy=False масив (незмінний, потрібного типу) використовується як є.
+        """
+        perm = cls.__new__(cls)
+        perm._init_array(array, copy)
+        return perm
+
+    def _init_array(self, array, copy=True):
+        size = len(array)
+        if copy:
+            array = np.array(array, dtype=_index_dtype(size))
+            array.setflags(write=False)
+
+        self.size = size
+        self.array = array
+        self._inverse = None
+        self._powers = None
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.array[index].tolist()
+        return int(self.array[index])
+
+    def __iter__(self):
+        return iter(self.array.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, Permutation):
+            return np.array_equal(self.array, other.array)
+        if isinstance(other, (list, tuple)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Permutation({self.tolist()})"
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array.astype(dtype if dtype is not None else np.int64)
+
+    def tolist(self):
+        """Підстановка як list"""
+        return self.array.tolist()
+
+    @property
+    def inverse(self):
+        """Обернена підстановка σ⁻¹ (кешується)"""
+        if self._inverse is None:
+            inv = np.empty(self.size, dtype=np.int64)
+            inv[self.array] = np.arange(self.size)
+            self._inverse = Permutation._from_array(inv)
+            self._inverse._inverse = self
+        return self._inverse
+
+    @property
+    def powers(self):
+        """SubstitutionPowers цієї підстановки (кешується)"""
+        if self._powers is None:
+            self._powers = SubstitutionPowers(self.array.tolist())
+        return self._powers
+
+    @property
+    def cycles(self):
+        """Розклад на незалежні цикли"""
+        return self.powers.cycles
+
+    @property
+    def order(self):
+        """Порядок підстановки - НСК довжин циклів"""
+        return self.powers.order
+
+    def power(self, k):
+        """
+        Обчислює σ^k за O(n)
+
+        Args:
+            k: Степінь (може бути від'ємним)
+
+        Returns:
+            Permutation: Підстановка σ^k
+        """
+        if k == 1:
+            return self
+        if k == -1:
+            return self.inverse
+        return Permutation._from_array(self.powers.apply(np.arange(self.size), k))
+
+    def apply(self, values, k=1):
+        """
+        Застосовує σ^k до масиву значень
+
+        Args:
+            values: Список або numpy array чисел (беруться за модулем розміру)
+            k: Степінь або numpy array степенів, що транслюється на values
+
+        Returns:
+            numpy array: Значення після застосування σ^k
+        """
+        if np.isscalar(k) and k == 1:
+            values = np.mod(np.asarray(values, dtype=np.int64), self.size)
+            return self.array[values].astype(np.int64)
+        return self.powers.apply(values, k)
+
+    def compose(self, other):
+        """
+        Композиція self ∘ other: x -> self(other(x))
+
+        Args:
+            other: Permutation або підстановка-список того ж розміру
+
+        Returns:
+            Permutation: Композиція підстановок
+        """
+        if len(other) != self.size:
+            raise ValueError("Підстановки мають бути однакового розміру")
+        if not isinstance(other, Permutation):
+            other = Permutation(other)
+        return Permutation._from_array(self.array[other.array])
+
+
+def as_substitution_powers(substitution):
+    """
+    Повертає SubstitutionPowers для підстановки. Готовий об'єкт
+    SubstitutionPowers (наприклад, з файлу ключа) використовується як є,
+    для Permutation - її кешований об'єкт.
+    """
+    if isinstance(substitution, SubstitutionPowers):
+        return substitution
+    if isinstance(substitution, Permutation):
+        return substitution.powers
+    return SubstitutionPowers(substitution)
 
 
 def substitution_to_string(substitution):
@@ -224,6 +656,183 @@ def string_to_substitution(string):
         raise ValueError("Некоректний формат підстановки")
 
 
+def substitution_to_lehmer(substitution):
+    """
+    Код Лемера підстановки - її номер у лексикографічному порядку всіх
+    перестановок (число у факторіальній системі числення)
+
+    Args:
+        substitution: Підстановка
+
+    Returns:
+        int: Число з [0, n!)
+    """
+    remaining = list(range(len(substitution)))
+    code = 0
+
+    # i-та цифра - кількість ще не використаних елементів, менших за σ(i)
+    for i, value in enumerate(substitution):
+        digit = bisect.bisect_left(remaining, value)
+        remaining.pop(digit)
+        code = code * (len(substitution) - i) + digit
+
+    return code
+
+
+def substitution_from_lehmer(code, size):
+    """
+    Відновлює підстановку за кодом Лемера
+
+    Args:
+        code: Код Лемера (0 <= code < size!)
+        size: Розмір підстановки
+
+    Returns:
+        Permutation: Підстановка
+
+    Raises:
+        ValueError: якщо код виходить за межі [0, size!)
+    """
+    if code < 0:
+        raise ValueError("Некоректний код Лемера")
+
+    digits = [0] * size
+    for base in range(1, size + 1):
+        code, digits[size - base] = divmod(code, base)
+
+    if code:
+        raise ValueError("Некоректний код Лемера")
+
+    remaining = list(range(size))
+    return Permutation._from_array(np.array([remaining.pop(digit) for digit in digits], dtype=np.int64))
+
+
+def substitution_to_bytes(substitution, lehmer=False):
+    """
+    Серіалізує підстановку у бінарний формат
+
+    Дані - масив little-endian найменшої ширини (1, 2 або 4 байти на
+    елемент), або при lehmer=True код Лемера (ceil(log2(n!) / 8) байт -
+    компактніше, але розкодовується за O(n²)). Заголовок містить CRC32 даних.
+
+    Args:
+        substitution: Підстановка або Permutation
+        lehmer: Зберегти код Лемера замість масиву
+
+    Returns:
+        bytes: Серіалізована підстановка
+    """
+    if not isinstance(substitution, Permutation):
+        substitution = Permutation(substitution)
+
+    if lehmer:
+        code = substitution_to_lehmer(substitution.array.tolist())
+        payload = code.to_bytes((code.bit_length() + 7) // 8, "little")
+        encoding = _ENCODING_LEHMER
+    else:
+        payload = substitution.array.astype(substitution.array.dtype.newbyteorder("<")).tobytes()
+        encoding = _ENCODING_ARRAY
+
+    header = _SUBST_HEADER.pack(
+        SUBSTITUTION_MAGIC, SUBSTITUTION_VERSION, encoding,
+        substitution.size, zlib.crc32(payload)
+    )
+    return header + payload
+
+
+def substitution_from_bytes(data):
+    """
+    Завантажує підстановку з бінарного формату
+
+    Масив фіксованої ширини не розбирається і не копіюється: Permutation
+    використовує numpy view на data. Коректність перевіряється через CRC32
+    та np.bincount (кожне значення 0..n-1 рівно один раз).
+
+    Args:
+        data: bytes, bytearray, memoryview або mmap
+
+    Returns:
+        Permutation: Підстановка
+
+    Raises:
+        ValueError: якщо дані пошкоджені або не є підстановкою
+    """
+    data = memoryview(data).cast("B")
+    if len(data) < _SUBST_HEADER.size:
+        raise ValueError("Дані не є бінарною підстановкою")
+
+    magic, version, encoding, size, checksum = _SUBST_HEADER.unpack_from(data)
+    if magic != SUBSTITUTION_MAGIC:
+        raise ValueError("Дані не є бінарною підстановкою")
+    if version != SUBSTITUTION_VERSION:
+        raise ValueError(f"Непідтримувана версія підстановки: {version}")
+    if size == 0:
+        raise ValueError("Підстановка порожня")
+
+    payload = data[_SUBST_HEADER.size:]
+    if zlib.crc32(payload) != checksum:
+        raise ValueError("Контрольна сума підстановки не збігається")
+
+    if encoding == _ENCODING_LEHMER:
+        return substitution_from_lehmer(int.from_bytes(payload, "little"), size)
+    if encoding != _ENCODING_ARRAY:
+        raise ValueError(f"Невідоме кодування підстановки: {encoding}")
+
+    dtype = np.dtype(_index_dtype(size)).newbyteorder("<")
+    if len(payload) != size * dtype.itemsize:
+        raise ValueError("Розмір даних не відповідає розміру підстановки")
+
+    array = np.frombuffer(payload, dtype=dtype)
+    if array.max() >= size:
+        raise ValueError(f"Значення {int(array.max())} виходить за межі діапазону [0, {size - 1}]")
+    if np.bincount(array, minlength=size).max() != 1:
+        raise ValueError("Підстановка містить дублікати")
+
+    if not array.flags.writeable:
+        return Permutation._from_array(array, copy=False)
+    return Permutation._from_array(array)
+
+
+def read_substitution(path):
+    """
+    Читає підстановку з файлу: бінарного (визначається за сигнатурою)
+    або текстового (числа через пробіл)
+
+    Args:
+        path: Шлях до файлу
+
+    Returns:
+        Permutation: Підстановка
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if data.startswith(SUBSTITUTION_MAGIC):
+        return substitution_from_bytes(data)
+
+    text = data.decode("utf-8").strip()
+    if not text:
+        raise ValueError("Підстановка порожня")
+    try:
+        values = np.array(text.split(), dtype=np.int64)
+    except ValueError:
+        raise ValueError("Некоректний формат підстановки")
+    return Permutation(values)
+
+
+def write_substitution(path, substitution, lehmer=False):
+    """
+    Зберігає підстановку у бінарному форматі (substitution_to_bytes)
+
+    Args:
+        path: Шлях до файлу
+        substitution: Підстановка або Permutation
+        lehmer: Зберегти код Лемера замість масиву
+    """
+    with open(path, "wb") as f:
+        f.write(substitution_to_bytes(substitution, lehmer))
+
+
 # Шаблони підстановок
 SUBSTITUTION_TEMPLATES = {
     "shift_1": lambda size: create_shift_substitution(size, 1),
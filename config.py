@@ -1,6 +1,8 @@
 """
 Конфігураційний файл
 """
+import os
+
 BG_COLOR = "#2F2235"        # Темно-фіолетовий фон
 FG_COLOR = "#BFC3BA"        # Світло-сірий текст
 CELL_BG = "#A9ACA9"         # Сірий для клітинок/кнопок
@@ -14,4 +16,14 @@ FONT_ITALIC = ("Arial", 9, "italic")
 
 # Інші параметри
 MAX_COLUMNS_ALPHABET = 20
-MAX_MATRIX_SIZE = 20
\ No newline at end of file
+MAX_MATRIX_SIZE = 20
+BRUTE_FORCE_BATCH_SIZE = 4096  # Кількість матриць, що перевіряються за один пакет
+BRUTE_FORCE_ROW_TOP_K = 4  # Кількість найкращих рядків оберненої матриці для кожної позиції
+
+# Кеш обернених матриць ключів на диску (вимкнено за замовчуванням).
+# Обернені матриці зберігаються у KEY_CACHE_DIR незашифрованими; у вікні
+# розшифрування кеш вмикається перемикачем "Кешувати обернені матриці на
+# диску", це значення - його початковий стан і налаштування для скриптів
+KEY_CACHE_ENABLED = False
+KEY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".hill_cipher", "key_cache")
+KEY_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Найстаріші записи видаляються при перевищенні
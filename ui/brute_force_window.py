@@ -12,11 +12,15 @@ from config import *
 from cipher.hill_cipher import (
     text_to_numbers,
     numbers_to_text,
-    hill_decrypt_standard,
+    split_into_blocks,
+    hill_multiply_blocks,
     hill_decrypt_modified
 )
+from cipher.hill_key import HillKey
+from cipher.key_recovery import recover_key_from_text, CrtInverseRowSearch
+from cipher.substitution import Permutation
 from utils.file_utils import load_text_file, save_file
-from utils.math_utils import determinant_int, mod_inverse
+from utils.math_utils import batch_matrix_mod_inverse
 from data.templates import ALPHABET_UKR
 
 
@@ -511,23 +515,25 @@ class BruteForceWindow:
 
         return round(accuracy, 2)
 
-    def is_valid_matrix(self, matrix, mod):
-        """Перевірка чи матриця має обернену за модулем"""
-        try:
-            det = determinant_int(matrix)
-            det_mod = det % mod
+    def candidate_batches(self, value_range, matrix_size):
+        """
+        Перебір матриць пакетами: для кожного пакета повертає масив матриць,
+        обернені за модулем та маску оборотності (batch_matrix_mod_inverse)
 
-            if det_mod == 0:
-                return False
+        Yields:
+            tuple: (matrices, inverses, mask)
+        """
+        mod = len(self.alphabet)
+        candidates = itertools.product(range(value_range), repeat=matrix_size * matrix_size)
 
-            # Перевіряємо чи є обернений елемент
-            for x in range(1, mod):
-                if (det_mod * x) % mod == 1:
-                    return True
+        while True:
+            chunk = list(itertools.islice(candidates, BRUTE_FORCE_BATCH_SIZE))
+            if not chunk:
+                return
 
-            return False
-        except:
-            return False
+            matrices = np.array(chunk, dtype=np.int64).reshape(-1, matrix_size, matrix_size)
+            inverses, mask = batch_matrix_mod_inverse(matrices, mod)
+            yield matrices, inverses, mask
 
     def brute_force_worker(self):
         """Робочий процес брутфорсу"""
@@ -549,35 +555,53 @@ class BruteForceWindow:
 
     def brute_force_standard(self, encrypted, expected, matrix_size, mod):
         """Брутфорс стандартного режиму"""
-        # Для малих матриць генеруємо всі можливі комбінації
-        # Обмежуємо діапазон значень для швидкості
-        value_range = min(mod, 10)  # Обмежуємо до 10 значень для швидкості
+        ciphertext_numbers = text_to_numbers(encrypted, self.alphabet)
+        if len(ciphertext_numbers) % matrix_size != 0:
+            return
+        blocks = split_into_blocks(ciphertext_numbers, matrix_size)
 
-        # Генеруємо всі можливі матриці
-        total_elements = matrix_size * matrix_size
+        # Спочатку - алгебраїчне відновлення ключа за очікуваним текстом:
+        # розв'язок лінійної системи за модулем замість перебору матриць
+        try:
+            key = recover_key_from_text(expected, encrypted, self.alphabet, matrix_size)
+        except ValueError:
+            key = None
+
+        if key is not None:
+            decrypted = numbers_to_text(key.decrypt_blocks(blocks).ravel(), self.alphabet)
+            accuracy = self.calculate_accuracy(decrypted, expected)
+            self.add_result(accuracy, key.matrix.tolist(), None, 0, decrypted)
+            self.attempts_count += 1
+            self.window.after(0, lambda c=self.attempts_count: self.attempts_var.set(str(c)))
+            return
 
-        for values in itertools.product(range(value_range), repeat=total_elements):
-            # Перевіряємо чи потрібно зупинитися
-            if not self.is_running:
-                return
+        # Далі - перебір по рядках оберненої матриці на повному діапазоні значень
+        expected_numbers = text_to_numbers(expected, self.alphabet)
+        known_blocks = min(len(expected_numbers) // matrix_size, len(blocks))
+        if known_blocks > 0:
+            self.row_search_standard(blocks, expected_numbers[:known_blocks * matrix_size], expected, mod)
+            return
 
-            # Очікуємо якщо на паузі
-            while self.is_paused and self.is_running:
-                time.sleep(0.1)
+        # Очікуваний текст коротший за блок - перебір матриць з обмеженим
+        # діапазоном значень (0..9) для швидкості
+        value_range = min(mod, 10)
 
-            # Формуємо матрицю
-            matrix = [list(values[i*matrix_size:(i+1)*matrix_size]) for i in range(matrix_size)]
+        # Оборотність і обернені матриці обчислюються пакетами
+        for matrices, inverses, mask in self.candidate_batches(value_range, matrix_size):
+            # Необоротні матриці пропускаються одразу всім пакетом
+            self.attempts_count += int((~mask).sum())
 
-            # Перевіряємо валідність матриці
-            if not self.is_valid_matrix(matrix, mod):
-                self.attempts_count += 1
-                self.window.after(0, lambda: self.attempts_var.set(str(self.attempts_count)))
-                continue
+            for matrix, inv in zip(matrices[mask], inverses[mask]):
+                # Перевіряємо чи потрібно зупинитися
+                if not self.is_running:
+                    return
 
-            # Спробуємо розшифрувати
-            try:
-                ciphertext_numbers = text_to_numbers(encrypted, self.alphabet)
-                dec_numbers = hill_decrypt_standard(ciphertext_numbers, matrix, self.alphabet)
+                # Очікуємо якщо на паузі
+                while self.is_paused and self.is_running:
+                    time.sleep(0.1)
+
+                # Розшифровуємо обчисленою оберненою матрицею
+                dec_numbers = hill_multiply_blocks(blocks, inv, mod).ravel()
                 decrypted = numbers_to_text(dec_numbers, self.alphabet)
 
                 # Обчислюємо точність
@@ -585,52 +609,93 @@ class BruteForceWindow:
 
                 # Додаємо до результатів якщо точність > 0
                 if accuracy > 0:
-                    self.add_result(accuracy, matrix, None, 0, decrypted)
+                    self.add_result(accuracy, matrix.tolist(), None, 0, decrypted)
 
-            except Exception:
-                pass
+                self.attempts_count += 1
 
-            self.attempts_count += 1
+                # Оновлюємо лічильник кожні 100 спроб
+                if self.attempts_count % 100 == 0:
+                    self.window.after(0, lambda c=self.attempts_count: self.attempts_var.set(str(c)))
 
-            # Оновлюємо лічильник кожні 100 спроб
-            if self.attempts_count % 100 == 0:
-                self.window.after(0, lambda c=self.attempts_count: self.attempts_var.set(str(c)))
+            self.window.after(0, lambda c=self.attempts_count: self.attempts_var.set(str(c)))
+
+    def row_search_standard(self, blocks, known_numbers, expected, mod):
+        """
+        Перебір стандартного режиму по рядках оберненої матриці окремо для
+        кожного степеня простого дільника модуля (CrtInverseRowSearch):
+        для mod = 33 перевіряється 3^n + 11^n рядків замість 33^(n²) матриць,
+        тому перебирається весь діапазон 0..mod-1
+        """
+        matrix_size = blocks.shape[1]
+        known_blocks = len(known_numbers) // matrix_size
+        search = CrtInverseRowSearch(
+            blocks[:known_blocks],
+            np.reshape(known_numbers, (known_blocks, matrix_size)),
+            mod,
+            BRUTE_FORCE_ROW_TOP_K
+        )
+
+        for component, start, stop in search.batches():
+            if not self.is_running:
+                return
+
+            while self.is_paused and self.is_running:
+                time.sleep(0.1)
+
+            search.update(component, start, stop)
+
+            # Спроба - один перевірений рядок
+            self.attempts_count += stop - start
+            self.window.after(0, lambda c=self.attempts_count: self.attempts_var.set(str(c)))
+
+        # Найкращі оборотні комбінації рядків (зберігається топ-5 результатів)
+        for found, (inverse, key_matrix, _) in enumerate(search.combinations(), 1):
+            dec_numbers = hill_multiply_blocks(blocks, inverse, mod).ravel()
+            decrypted = numbers_to_text(dec_numbers, self.alphabet)
+
+            accuracy = self.calculate_accuracy(decrypted, expected)
+            if accuracy > 0:
+                self.add_result(accuracy, key_matrix.tolist(), None, 0, decrypted)
+
+            if found >= 5:
+                break
 
     def brute_force_modified(self, encrypted, expected, matrix_size, mod, max_noise):
         """Брутфорс модифікованого режиму"""
         value_range = min(mod, 8)  # Менший діапазон для модифікованого режиму
 
-        total_elements = matrix_size * matrix_size
+        # Довжини шуму, менші за розмір матриці
+        noise_lengths = [noise for noise in range(max_noise + 1) if noise < matrix_size]
 
-        # Перебираємо різні довжини шуму
-        for noise_length in range(max_noise + 1):
-            if noise_length >= matrix_size:
-                continue
+        # Прості підстановки (циклічний зсув). Permutation кешує розклад на
+        # цикли, тому він будується один раз, а не для кожної матриці
+        substitutions = [Permutation(np.roll(np.arange(mod), -shift)) for shift in range(mod)]
 
-            # Генеруємо прості підстановки (циклічний зсув)
-            for shift in range(mod):
-                substitution = [(i + shift) % mod for i in range(mod)]
+        # Кількість спроб (шум × підстановка) для кожної матриці
+        trials_per_matrix = len(noise_lengths) * len(substitutions)
 
-                # Генеруємо матриці
-                for values in itertools.product(range(value_range), repeat=total_elements):
+        # Генеруємо матриці пакетами. Матриця - зовнішній цикл, щоб ключ
+        # (перевірка та обернена матриця) обчислювався один раз для всіх
+        # шумів і підстановок
+        for matrices, inverses, mask in self.candidate_batches(value_range, matrix_size):
+            # Необоротні матриці пропускаються разом з усіма їх спробами
+            self.attempts_count += int((~mask).sum()) * trials_per_matrix
+
+            for matrix, inv in zip(matrices[mask], inverses[mask]):
+                key = HillKey.from_parts(matrix, mod, inv)
+                matrix_list = matrix.tolist()
+
+                for noise_length, substitution in itertools.product(noise_lengths, substitutions):
                     if not self.is_running:
                         return
 
                     while self.is_paused and self.is_running:
                         time.sleep(0.1)
 
-                    matrix = [list(values[i*matrix_size:(i+1)*matrix_size]) for i in range(matrix_size)]
-
-                    if not self.is_valid_matrix(matrix, mod):
-                        self.attempts_count += 1
-                        if self.attempts_count % 100 == 0:
-                            self.window.after(0, lambda c=self.attempts_count: self.attempts_var.set(str(c)))
-                        continue
-
                     try:
                         decrypted = hill_decrypt_modified(
                             encrypted,
-                            matrix,
+                            key,
                             self.alphabet,
                             substitution,
                             noise_length
@@ -639,7 +704,7 @@ class BruteForceWindow:
                         accuracy = self.calculate_accuracy(decrypted, expected)
 
                         if accuracy > 0:
-                            self.add_result(accuracy, matrix, substitution, noise_length, decrypted)
+                            self.add_result(accuracy, matrix_list, substitution, noise_length, decrypted)
 
                     except Exception:
                         pass
@@ -14,10 +14,13 @@ from cipher.hill_cipher import (
     hill_decrypt_standard,
     hill_decrypt_modified
 )
+from cipher.hill_key import as_hill_key
+from cipher.key_cache import get_key_cache
 from utils.file_utils import (
-    load_text_file, load_matrix_file, save_file,
+    load_text_file, load_matrix_file, save_file, load_key_bundle_into_window,
     remove_padding, base64_to_file, DEFAULT_PADDING_SYMBOL
 )
+from utils import telemetry
 from data.templates import ALPHABET_UKR
 
 
@@ -31,6 +34,7 @@ class DecryptWindow:
         self.alphabet = ALPHABET_UKR
         self.alphabet_name = "Український"
         self.loaded_matrix_dec = None
+        self.hill_key = None
         self.substitution_mapping_dec = []
         self.selected_file_path = None
 
@@ -327,6 +331,29 @@ class DecryptWindow:
             fg="black"
         ).pack(side="left", padx=5)
 
+        tk.Button(
+            matrix_label_frame,
+            text="Завантажити пакет ключа",
+            command=self.load_key_bundle,
+            bg=CELL_BG,
+            fg="black"
+        ).pack(side="left", padx=5)
+
+        # ==================== КЕШ ОБЕРНЕНИХ МАТРИЦЬ ====================
+        # Обернені матриці ключів зберігаються на диску (KEY_CACHE_DIR)
+        # незашифрованими, тому кеш вмикається явно
+        self.use_key_cache = tk.BooleanVar(value=KEY_CACHE_ENABLED)
+        tk.Checkbutton(
+            self.window,
+            text="Кешувати обернені матриці на диску",
+            variable=self.use_key_cache,
+            bg=BG_COLOR,
+            fg=FG_COLOR,
+            selectcolor=CELL_BG,
+            activebackground=BG_COLOR,
+            font=FONT_NORMAL
+        ).pack(pady=5)
+
         # ==================== КНОПКА РОЗШИФРУВАННЯ ====================
         self.decrypt_btn = tk.Button(
             self.window,
@@ -338,6 +365,15 @@ class DecryptWindow:
         )
         self.decrypt_btn.pack(pady=10)
 
+        # ==================== РЯДОК СТАНУ ====================
+        # Події обчислень (обернення матриці, час виконання)
+        self.status_line = telemetry.StatusLine(
+            self.window,
+            bg=BG_COLOR,
+            fg=FG_COLOR,
+            font=FONT_ITALIC
+        )
+
         # Початкова видимість підстановки
         self.toggle_subst_frame()
         self.toggle_input_mode()
@@ -466,8 +502,24 @@ class DecryptWindow:
         matrix, name = load_matrix_file()
         if matrix is not None:
             self.loaded_matrix_dec = matrix
+            self.hill_key = None
             self.loaded_matrix_var_dec.set(name if name else "Завантажено")
 
+    def load_key_bundle(self):
+        """Завантажити пакет ключа (алфавіт, матриця з оберненою, підстановка)"""
+        load_key_bundle_into_window(self, "loaded_matrix_dec", "loaded_matrix_var_dec", "substitution_mapping_dec")
+
+    def get_hill_key(self):
+        """Скомпільований ключ для поточної матриці та алфавіту (кешується)"""
+        if self.hill_key is None or self.hill_key.modulus != len(self.alphabet):
+            self.hill_key = as_hill_key(self.loaded_matrix_dec, len(self.alphabet))
+
+        # Обернена матриця береться з кешу на диску, якщо ключ вже використовувався
+        cache = get_key_cache(self.use_key_cache.get())
+        if cache is not None:
+            cache.ensure_inverse(self.hill_key)
+        return self.hill_key
+
     def decrypt(self):
         """Розшифрувати текст або файл"""
         if self.input_mode.get() == 0:
@@ -504,7 +556,7 @@ class DecryptWindow:
                 ciphertext_numbers = text_to_numbers(txt, self.alphabet)
                 dec_numbers = hill_decrypt_standard(
                     ciphertext_numbers,
-                    self.loaded_matrix_dec,
+                    self.get_hill_key(),
                     self.alphabet
                 )
                 dec_txt = numbers_to_text(dec_numbers, self.alphabet)
@@ -539,7 +591,7 @@ class DecryptWindow:
                 # Розшифрування з підстановкою та шумом
                 dec_txt = hill_decrypt_modified(
                     txt,
-                    self.loaded_matrix_dec,
+                    self.get_hill_key(),
                     self.alphabet,
                     self.substitution_mapping_dec,
                     noise_length
@@ -547,7 +599,7 @@ class DecryptWindow:
 
             end_time = time.time()
             decryption_time = end_time - start_time
-            print(f"Час розшифрування тексту: {decryption_time:.6f} секунд")
+            telemetry.record('timing', operation="Час розшифрування тексту", seconds=decryption_time)
 
             # ==================== ЗБЕРЕЖЕННЯ РЕЗУЛЬТАТУ ====================
             success = save_file(
@@ -614,7 +666,7 @@ class DecryptWindow:
                 ciphertext_numbers = text_to_numbers(encrypted_text, self.alphabet)
                 dec_numbers = hill_decrypt_standard(
                     ciphertext_numbers,
-                    self.loaded_matrix_dec,
+                    self.get_hill_key(),
                     self.alphabet
                 )
                 decrypted_text = numbers_to_text(dec_numbers, self.alphabet)
@@ -648,7 +700,7 @@ class DecryptWindow:
 
                 decrypted_text = hill_decrypt_modified(
                     encrypted_text,
-                    self.loaded_matrix_dec,
+                    self.get_hill_key(),
                     self.alphabet,
                     self.substitution_mapping_dec,
                     noise_length
@@ -656,7 +708,7 @@ class DecryptWindow:
 
             end_time = time.time()
             decryption_time = end_time - start_time
-            print(f"Час розшифрування файлу: {decryption_time:.6f} секунд")
+            telemetry.record('timing', operation="Час розшифрування файлу", seconds=decryption_time)
 
             # 3. Видаляємо padding
             clean_text, padding_removed = remove_padding(decrypted_text, padding_symbol)
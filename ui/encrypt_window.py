@@ -9,14 +9,18 @@ from tkinter import messagebox, filedialog
 from config import *
 from cipher.hill_cipher import (
     text_to_numbers,
+    numbers_to_text,
     hill_encrypt_standard,
     hill_encrypt_modified
 )
+from cipher.hill_key import as_hill_key
 from utils.file_utils import (
     load_text_file, load_matrix_file, save_file,
+    load_key_bundle_into_window, save_key_bundle_file,
     file_to_base64_with_marker, add_padding_for_matrix,
     validate_text_for_alphabet, DEFAULT_PADDING_SYMBOL
 )
+from utils import telemetry
 from data.templates import ALPHABET_UKR
 
 
@@ -31,6 +35,7 @@ class EncryptWindow:
         self.alphabet_name = "Український"
         self.substitution_mapping = []
         self.loaded_matrix = None
+        self.hill_key = None
         self.selected_file_path = None
 
         self.create_widgets()
@@ -307,6 +312,22 @@ class EncryptWindow:
             fg="black"
         ).pack(side="left", padx=5)
 
+        tk.Button(
+            matrix_label_frame,
+            text="Завантажити пакет ключа",
+            command=self.load_key_bundle,
+            bg=CELL_BG,
+            fg="black"
+        ).pack(side="left", padx=5)
+
+        tk.Button(
+            matrix_label_frame,
+            text="Зберегти пакет ключа",
+            command=self.save_key_bundle,
+            bg=CELL_BG,
+            fg="black"
+        ).pack(side="left", padx=5)
+
         # ==================== КНОПКА ШИФРУВАННЯ ====================
         self.encrypt_btn = tk.Button(
             self.window,
@@ -318,6 +339,15 @@ class EncryptWindow:
         )
         self.encrypt_btn.pack(pady=10)
 
+        # ==================== РЯДОК СТАНУ ====================
+        # Події обчислень (обернення матриці, час виконання)
+        self.status_line = telemetry.StatusLine(
+            self.window,
+            bg=BG_COLOR,
+            fg=FG_COLOR,
+            font=FONT_ITALIC
+        )
+
         self.update_subst_visibility()
         self.toggle_input_mode()
 
@@ -419,8 +449,38 @@ class EncryptWindow:
         matrix, name = load_matrix_file()
         if matrix is not None:
             self.loaded_matrix = matrix
+            self.hill_key = None
             self.loaded_matrix_var.set(name if name else "Завантажено")
 
+    def load_key_bundle(self):
+        """Завантажити пакет ключа (алфавіт, матриця з оберненою, підстановка)"""
+        load_key_bundle_into_window(self, "loaded_matrix", "loaded_matrix_var", "substitution_mapping")
+
+    def save_key_bundle(self):
+        """Зберегти алфавіт, матрицю та підстановку одним пакетом ключа"""
+        if self.loaded_matrix is None:
+            messagebox.showerror("Помилка", "Завантажте ключову матрицю!")
+            return
+
+        try:
+            key = self.get_hill_key()
+        except ValueError as e:
+            messagebox.showerror("Помилка", str(e))
+            return
+
+        save_key_bundle_file(
+            self.alphabet,
+            key,
+            self.substitution_mapping or None,
+            f"Key_{self.alphabet_name}.hkb"
+        )
+
+    def get_hill_key(self):
+        """Скомпільований ключ для поточної матриці та алфавіту (кешується)"""
+        if self.hill_key is None or self.hill_key.modulus != len(self.alphabet):
+            self.hill_key = as_hill_key(self.loaded_matrix, len(self.alphabet))
+        return self.hill_key
+
     def encrypt(self):
         """Зашифрувати текст або файл"""
         if self.input_mode.get() == 0:
@@ -452,10 +512,10 @@ class EncryptWindow:
                 numbers = text_to_numbers(txt, self.alphabet)
                 enc_numbers = hill_encrypt_standard(
                     numbers,
-                    self.loaded_matrix,
+                    self.get_hill_key(),
                     self.alphabet
                 )
-                enc_txt = "".join(self.alphabet[num] for num in enc_numbers)
+                enc_txt = numbers_to_text(enc_numbers, self.alphabet)
             else:
                 if not self.substitution_mapping:
                     messagebox.showerror("Помилка", "Підстановку не вибрано!")
@@ -483,7 +543,7 @@ class EncryptWindow:
 
                 enc_txt = hill_encrypt_modified(
                     txt,
-                    self.loaded_matrix,
+                    self.get_hill_key(),
                     self.alphabet,
                     self.substitution_mapping,
                     noise_length
@@ -491,7 +551,7 @@ class EncryptWindow:
 
             end_time = time.time()
             encryption_time = end_time - start_time
-            print(f"Час шифрування тексту: {encryption_time:.6f} секунд")
+            telemetry.record('timing', operation="Час шифрування тексту", seconds=encryption_time)
 
             save_file(enc_txt, "text_encrypted.txt", "Зберегти зашифрований текст")
 
@@ -550,10 +610,10 @@ class EncryptWindow:
                 numbers = text_to_numbers(padded_text, self.alphabet)
                 enc_numbers = hill_encrypt_standard(
                     numbers,
-                    self.loaded_matrix,
+                    self.get_hill_key(),
                     self.alphabet
                 )
-                enc_txt = "".join(self.alphabet[num] for num in enc_numbers)
+                enc_txt = numbers_to_text(enc_numbers, self.alphabet)
             else:
                 # Модифіковане шифрування
                 if not self.substitution_mapping:
@@ -582,7 +642,7 @@ class EncryptWindow:
 
                 enc_txt = hill_encrypt_modified(
                     padded_text,
-                    self.loaded_matrix,
+                    self.get_hill_key(),
                     self.alphabet,
                     self.substitution_mapping,
                     noise_length
@@ -590,7 +650,7 @@ class EncryptWindow:
 
             end_time = time.time()
             encryption_time = end_time - start_time
-            print(f"Час шифрування файлу: {encryption_time:.6f} секунд")
+            telemetry.record('timing', operation="Час шифрування файлу", seconds=encryption_time)
 
             # 5. Зберігаємо результат
             base_name = os.path.splitext(os.path.basename(self.selected_file_path))[0]
@@ -7,8 +7,9 @@ from tkinter import messagebox
 import secrets
 import numpy as np
 from config import *
-from utils.math_utils import determinant, is_prime
-from utils.file_utils import save_file, load_matrix_file
+from utils.math_utils import determinant, is_prime, CirculantMatrix
+from utils.file_utils import save_file, load_matrix_file, format_matrix
+from cipher.hill_key import generate_hill_key
 
 
 class MatrixWindow:
@@ -145,6 +146,27 @@ class MatrixWindow:
             fg="black"
         ).pack(side="left", padx=5)
 
+        # Випадкова оборотна матриця
+        random_frame = tk.Frame(self.standard_frame, bg=BG_COLOR)
+        random_frame.pack(pady=5)
+        tk.Label(
+            random_frame,
+            text="Розмір алфавіту:",
+            bg=BG_COLOR,
+            fg=FG_COLOR,
+            font=FONT_BOLD
+        ).pack(side="left", padx=5)
+        self.random_modulus_entry = tk.Entry(random_frame, width=5, font=FONT_NORMAL)
+        self.random_modulus_entry.pack(side="left")
+
+        tk.Button(
+            random_frame,
+            text="Випадкова оборотна матриця",
+            command=self.fill_random_matrix,
+            bg=CELL_BG,
+            fg="black"
+        ).pack(side="left", padx=5)
+
         # Визначник
         det_frame = tk.Frame(self.standard_frame, bg=BG_COLOR)
         det_frame.pack(pady=5)
@@ -370,6 +392,28 @@ class MatrixWindow:
                 row_entries.append(e)
             self.matrix_entries.append(row_entries)
 
+    def fill_random_matrix(self):
+        """Заповнення полів випадковою оборотною за модулем матрицею"""
+        try:
+            modulus = int(self.random_modulus_entry.get())
+            if modulus < 2:
+                raise ValueError("Розмір алфавіту має бути не менше 2.")
+        except ValueError as e:
+            messagebox.showerror("Помилка", f"Некоректний розмір алфавіту:\n{e}")
+            return
+
+        if not self.matrix_entries:
+            return
+
+        key = generate_hill_key(len(self.matrix_entries), modulus)
+
+        for i, row in enumerate(key.tolist()):
+            for j, value in enumerate(row):
+                self.matrix_entries[i][j].delete(0, tk.END)
+                self.matrix_entries[i][j].insert(0, str(value))
+
+        self.det_value_var.set(f"{key.det} (mod {modulus})")
+
     def calc_det(self):
         """Обчислення визначника"""
         try:
@@ -497,9 +541,7 @@ class MatrixWindow:
                     pow(alpha, pow(secret_key, i, 1000), alphabet_size)
                     for i in range(size)
                 ]
-                self.generated_circular_matrix = [
-                    first_row[-i:] + first_row[:-i] for i in range(size)
-                ]
+                self.generated_circular_matrix = CirculantMatrix(first_row)
 
             except Exception as e:
                 messagebox.showerror("Помилка", str(e))
@@ -514,10 +556,7 @@ class MatrixWindow:
                 messagebox.showerror("Помилка", "Введіть назву файлу.")
                 return
 
-            content = "\n".join(
-                ','.join(map(str, row))
-                for row in self.generated_circular_matrix
-            )
+            content = format_matrix(self.generated_circular_matrix)
 
             if save_file(content, f"Matrix_{filename}.txt", "Зберегти матрицю"):
                 sig_win.destroy()
@@ -569,14 +608,9 @@ class MatrixWindow:
                 pow(alpha, pow(secret_key, i, 1000), alphabet_size)
                 for i in range(size)
             ]
-            self.generated_circular_matrix = [
-                first_row[-i:] + first_row[:-i] for i in range(size)
-            ]
+            self.generated_circular_matrix = CirculantMatrix(first_row)
 
-            content = "\n".join(
-                ','.join(map(str, row))
-                for row in self.generated_circular_matrix
-            )
+            content = format_matrix(self.generated_circular_matrix)
 
             messagebox.showinfo(
                 "Інформація",
@@ -608,7 +642,7 @@ class MatrixWindow:
                 messagebox.showerror("Помилка", "Введіть назву матриці!")
                 return
 
-            content = "\n".join(','.join(str(x) for x in row) for row in mat)
+            content = format_matrix(mat)
             save_file(content, f"Matrix_{name_suffix}.txt", "Зберегти матрицю")
 
         except Exception as e:
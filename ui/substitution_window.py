@@ -9,10 +9,11 @@ from config import *
 from cipher.substitution import (
     generate_random_substitution,
     validate_substitution,
-    substitution_to_string,
-    string_to_substitution
+    string_to_substitution,
+    substitution_from_bytes,
+    SUBSTITUTION_MAGIC
 )
-from utils.file_utils import save_file
+from utils.file_utils import save_substitution_file
 from data.templates import ALPHABET_UKR
 
 
@@ -321,20 +322,25 @@ class SubstitutionWindow:
 
         fpath = filedialog.askopenfilename(
             title="Відкрити підстановку",
-            filetypes=[("Text Files", "*.txt")]
+            filetypes=[("Substitution Files", "*.txt *.subst"), ("All Files", "*.*")]
         )
         if not fpath:
             return
 
         try:
-            with open(fpath, "r", encoding="utf-8") as f:
-                data = f.read().strip()
-
-            if not data:
-                messagebox.showerror("Помилка", "Файл порожній!")
-                return
-
-            substitution = string_to_substitution(data)
+            with open(fpath, "rb") as f:
+                data = f.read()
+
+            if data.startswith(SUBSTITUTION_MAGIC):
+                substitution = substitution_from_bytes(data).tolist()
+            else:
+                # Текстовий файл не перевіряється: некоректну підстановку можна
+                # відкрити в редакторі й виправити (помилки показує update_info)
+                data = data.decode("utf-8").strip()
+                if not data:
+                    messagebox.showerror("Помилка", "Файл порожній!")
+                    return
+                substitution = string_to_substitution(data)
 
             size = len(substitution)
             self.size_entry.delete(0, tk.END)
@@ -405,9 +411,4 @@ class SubstitutionWindow:
             self.substitution_name_entry.get().strip() or "Substitution_Auto"
         )
 
-        content = substitution_to_string(numbers)
-        save_file(
-            content,
-            f"Substitution_{substitution_name}.txt",
-            "Зберегти підстановку"
-        )
\ No newline at end of file
+        save_substitution_file(numbers, f"Substitution_{substitution_name}.txt")
\ No newline at end of file
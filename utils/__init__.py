@@ -7,13 +7,31 @@ from .math_utils import (
     mod_inverse,
     determinant,
     matrix_minor,
-    matrix_mod_inverse
+    det_mod,
+    determinant_multimodular,
+    batch_det_mod,
+    batch_matrix_mod_inverse,
+    matrix_mod_inverse,
+    solve_linear_mod,
+    circulant_inverse_row,
+    verify_inverse_mod,
+    CirculantMatrix,
+    factorize,
+    crt_combine
 )
 
+from . import telemetry
+
 from .file_utils import (
     load_alphabet_file,
     load_matrix_file,
+    format_matrix,
+    parse_matrix,
     load_substitution_file,
+    save_substitution_file,
+    load_key_bundle_file,
+    load_key_bundle_into_window,
+    save_key_bundle_file,
     load_text_file,
     save_file
 )
@@ -23,10 +41,27 @@ __all__ = [
     'mod_inverse',
     'determinant',
     'matrix_minor',
+    'det_mod',
+    'determinant_multimodular',
+    'batch_det_mod',
+    'batch_matrix_mod_inverse',
     'matrix_mod_inverse',
+    'solve_linear_mod',
+    'circulant_inverse_row',
+    'verify_inverse_mod',
+    'CirculantMatrix',
+    'factorize',
+    'crt_combine',
+    'telemetry',
     'load_alphabet_file',
     'load_matrix_file',
+    'format_matrix',
+    'parse_matrix',
     'load_substitution_file',
+    'save_substitution_file',
+    'load_key_bundle_file',
+    'load_key_bundle_into_window',
+    'save_key_bundle_file',
     'load_text_file',
     'save_file'
 ]
\ No newline at end of file
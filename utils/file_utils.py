@@ -5,6 +5,7 @@
 import os
 import base64
 from tkinter import filedialog, messagebox
+from .math_utils import CirculantMatrix
 
 # Стандартні символи Base64
 BASE64_CHARS = set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=')
@@ -12,6 +13,9 @@ BASE64_CHARS = set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz01234567
 # Символ для padding за замовчуванням
 DEFAULT_PADDING_SYMBOL = "."
 
+# Префікс компактного формату циркулянтної матриці: "circulant: c0,c1,...,cn-1"
+CIRCULANT_PREFIX = "circulant:"
+
 
 def validate_alphabet_for_base64(alphabet, padding_symbol, include_ext_marker=True):
     """
@@ -148,6 +152,49 @@ def base64_to_file(base64_text, output_dir, base_filename):
         return False, str(e)
 
 
+def format_matrix(matrix):
+    """
+    Текстове представлення матриці для файлу ключа.
+    Циркулянтна матриця зберігається одним першим рядком з префіксом
+    CIRCULANT_PREFIX, звичайна - рядками чисел через кому.
+    """
+    if isinstance(matrix, CirculantMatrix):
+        return f"{CIRCULANT_PREFIX} " + ','.join(map(str, matrix.first_row))
+
+    return "\n".join(','.join(str(x) for x in row) for row in matrix)
+
+
+def parse_matrix(content):
+    """
+    Розбір тексту файлу ключа (формат format_matrix).
+
+    Returns:
+        list of lists або CirculantMatrix
+
+    Raises:
+        ValueError: якщо матриця не квадратна або порожня
+    """
+    content = content.strip()
+
+    if content.lower().startswith(CIRCULANT_PREFIX):
+        body = content[len(CIRCULANT_PREFIX):]
+        first_row = [int(part.strip()) for part in body.replace("\n", ",").split(',') if part.strip()]
+        return CirculantMatrix(first_row)
+
+    matrix_data = []
+    for row in content.splitlines():
+        parts = row.split(',')
+        row_data = [int(part.strip()) for part in parts if part.strip()]
+        if row_data:
+            matrix_data.append(row_data)
+
+    n = len(matrix_data)
+    if n == 0 or not all(len(r) == n for r in matrix_data):
+        raise ValueError("Матриця повинна бути квадратною!")
+
+    return matrix_data
+
+
 def load_alphabet_file():
     """Завантаження алфавіту з файлу"""
     fpath = filedialog.askopenfilename(
@@ -189,18 +236,7 @@ def load_matrix_file():
             messagebox.showerror("Помилка", "Файл порожній!")
             return None, None
 
-        rows = content.splitlines()
-        matrix_data = []
-        for row in rows:
-            parts = row.split(',')
-            row_data = [int(part.strip()) for part in parts if part.strip()]
-            if row_data:
-                matrix_data.append(row_data)
-
-        n = len(matrix_data)
-        if not all(len(r) == n for r in matrix_data):
-            messagebox.showerror("Помилка", "Матриця повинна бути квадратною!")
-            return None, None
+        matrix_data = parse_matrix(content)
 
         name = os.path.splitext(os.path.basename(fpath))[0]
         return matrix_data, name
@@ -209,26 +245,96 @@ def load_matrix_file():
         return None, None
 
 
-def load_substitution_file():
-    """Завантаження підстановки з файлу"""
-    fpath = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
+def load_key_bundle_file():
+    """Завантаження пакета ключа (алфавіт, матриця, обернена, підстановка)"""
+    from cipher.key_bundle import load_key_bundle
+
+    fpath = filedialog.askopenfilename(
+        title="Відкрити пакет ключа",
+        filetypes=[("Key Bundle", "*.hkb"), ("All Files", "*.*")]
+    )
     if not fpath:
         return None, None
 
     try:
-        with open(fpath, "r", encoding="utf-8") as f:
-            data = f.read().strip()
+        bundle = load_key_bundle(fpath)
+        name = os.path.splitext(os.path.basename(fpath))[0]
+        return bundle, name
+    except Exception as e:
+        messagebox.showerror("Помилка", f"Не вдалося завантажити пакет ключа:\n{e}")
+        return None, None
 
-        if not data:
-            messagebox.showerror("Помилка", "Файл підстановки порожній!")
-            return None, None
 
-        parts = data.split()
-        mapping = [int(x) for x in parts]
+def load_key_bundle_into_window(window, matrix_attr, matrix_var_attr, mapping_attr):
+    """
+    Завантаження пакета ключа у вікно шифрування/розшифрування: алфавіт,
+    ключ з уже відомою оберненою матрицею та підстановка (якщо є)
 
-        if len(mapping) != len(set(mapping)):
-            messagebox.showerror("Помилка", "Підстановка містить дублікати!")
-            return None, None
+    Args:
+        window: вікно з атрибутами alphabet, alphabet_name, alphabet_info_var,
+            hill_key та subst_name_var
+        matrix_attr: назва атрибута ключової матриці вікна
+        matrix_var_attr: назва StringVar з іменем ключової матриці
+        mapping_attr: назва атрибута підстановки вікна
+
+    Returns:
+        bool: True, якщо пакет завантажено
+    """
+    bundle, name = load_key_bundle_file()
+    if bundle is None:
+        return False
+
+    window.alphabet = bundle.alphabet
+    window.alphabet_name = name
+    window.alphabet_info_var.set(f"{window.alphabet_name} ({len(window.alphabet)})")
+
+    # Ключ з пакета вже містить обернену матрицю
+    setattr(window, matrix_attr, bundle.key)
+    window.hill_key = bundle.key
+    getattr(window, matrix_var_attr).set(name)
+
+    if bundle.powers is not None:
+        setattr(window, mapping_attr, bundle.powers)
+        window.subst_name_var.set(name)
+
+    return True
+
+
+def save_key_bundle_file(alphabet, key_matrix, substitution, default_name):
+    """Збереження пакета ключа"""
+    from cipher.key_bundle import save_key_bundle
+
+    file_path = filedialog.asksaveasfilename(
+        initialfile=default_name,
+        defaultextension=".hkb",
+        filetypes=[("Key Bundle", "*.hkb")],
+        title="Зберегти пакет ключа"
+    )
+
+    if not file_path:
+        return False
+
+    try:
+        save_key_bundle(file_path, alphabet, key_matrix, substitution)
+        messagebox.showinfo("Успіх", f"Файл збережено:\n{file_path}")
+        return True
+    except Exception as e:
+        messagebox.showerror("Помилка", f"Не вдалося зберегти пакет ключа:\n{e}")
+        return False
+
+
+def load_substitution_file():
+    """Завантаження підстановки з текстового або бінарного файлу (повертає Permutation)"""
+    from cipher.substitution import read_substitution
+
+    fpath = filedialog.askopenfilename(
+        filetypes=[("Substitution Files", "*.txt *.subst"), ("All Files", "*.*")]
+    )
+    if not fpath:
+        return None, None
+
+    try:
+        mapping = read_substitution(fpath)
 
         name = os.path.splitext(os.path.basename(fpath))[0]
         return mapping, name
@@ -237,6 +343,33 @@ def load_substitution_file():
         return None, None
 
 
+def save_substitution_file(substitution, default_name):
+    """Збереження підстановки: текстом (.txt) або в бінарному форматі (.subst)"""
+    from cipher.substitution import substitution_to_string, write_substitution
+
+    file_path = filedialog.asksaveasfilename(
+        initialfile=default_name,
+        defaultextension=".txt",
+        filetypes=[("Text Files", "*.txt"), ("Binary Substitution", "*.subst")],
+        title="Зберегти підстановку"
+    )
+
+    if not file_path:
+        return False
+
+    try:
+        if file_path.lower().endswith(".subst"):
+            write_substitution(file_path, substitution)
+        else:
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(substitution_to_string(substitution))
+        messagebox.showinfo("Успіх", f"Файл збережено:\n{file_path}")
+        return True
+    except Exception as e:
+        messagebox.showerror("Помилка", f"Не вдалося зберегти підстановку:\n{e}")
+        return False
+
+
 def load_text_file():
     """Завантаження текстового файлу"""
     fpath = filedialog.askopenfilename(
@@ -2,22 +2,85 @@
 Математичні утиліти для шифрування
 """
 
+import math
 import numpy as np
 from functools import lru_cache
+from . import telemetry
 
-# Глобальна змінна для логування циркулянтних матриць
-_circulant_matrix_log = []
+# Події журналу телеметрії, пов'язані з циркулянтними матрицями
+_CIRCULANT_EVENTS = ('circulant_detected', 'circulant_inverse')
+
+# Прості числа трохи менші за 2^31 для мультимодульного детермінанта:
+# добуток двох лишків вміщується в int64
+_WORD_PRIME_LIMIT = 2 ** 31
+_word_primes = []
 
 
 def get_circulant_log():
-    """Повертає лог циркулянтних матриць"""
-    return _circulant_matrix_log
+    """Повертає лог циркулянтних матриць (події журналу телеметрії)"""
+    return telemetry.get_events(_CIRCULANT_EVENTS)
 
 
 def clear_circulant_log():
-    """Очищає лог циркулянтних матриць"""
-    global _circulant_matrix_log
-    _circulant_matrix_log = []
+    """Очищає журнал телеметрії (включно з логом циркулянтних матриць)"""
+    telemetry.clear_events()
+
+
+class CirculantMatrix:
+    """
+    Циркулянтна матриця, що зберігає тільки перший рядок - O(n) пам'яті.
+
+    Рядок i - циклічний зсув першого рядка вправо на i позицій:
+    C[i][j] = c[(j - i) % n]. Поводиться як list of lists (len, індексування
+    рядків, ітерація), тому може передаватися всюди, де очікується матриця;
+    повна матриця будується тільки при явному перетворенні (tolist, numpy).
+    """
+
+    def __init__(self, first_row):
+        """
+        Args:
+            first_row: перший рядок матриці (послідовність цілих чисел)
+        """
+        row = [int(x) for x in first_row]
+        if not row:
+            raise ValueError("Перший рядок циркулянтної матриці порожній")
+        self.first_row = row
+
+    def __len__(self):
+        return len(self.first_row)
+
+    def __getitem__(self, i):
+        n = len(self.first_row)
+        if not -n <= i < n:
+            raise IndexError("Індекс рядка поза межами матриці")
+        shift = i % n
+        return self.first_row[n - shift:] + self.first_row[:n - shift]
+
+    def __iter__(self):
+        for i in range(len(self.first_row)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, CirculantMatrix):
+            return self.first_row == other.first_row
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CirculantMatrix({self.first_row})"
+
+    def __array__(self, dtype=None, copy=None):
+        return self.to_numpy(dtype)
+
+    def to_numpy(self, dtype=None):
+        """Повна матриця як numpy array (n × n)"""
+        row = np.array(self.first_row, dtype=dtype if dtype is not None else np.int64)
+        n = len(row)
+        idx = np.mod(np.arange(n)[None, :] - np.arange(n)[:, None], n)
+        return row[idx]
+
+    def tolist(self):
+        """Повна матриця як list of lists"""
+        return [self[i] for i in range(len(self))]
 
 
 def is_circulant_matrix(matrix):
@@ -31,6 +94,9 @@ def is_circulant_matrix(matrix):
     Returns:
         bool: True якщо матриця циркулянтна
     """
+    if isinstance(matrix, CirculantMatrix):
+        return True
+
     if hasattr(matrix, 'tolist'):
         matrix = matrix.tolist()
 
@@ -60,12 +126,9 @@ def circulant_determinant(matrix):
     Визначник циркулянтної матриці = добуток p(ω^k) для k=0..n-1,
     де p(x) = c0 + c1*x + ... + cn-1*x^(n-1) та ω - примітивний корінь n-го степеня з 1.
 
-    Для цілочисельних обчислень використовуємо стандартний алгоритм,
-    але з оптимізацією через властивості циркулянтної матриці.
+    Для цілочисельних обчислень використовуємо мультимодульний метод.
     """
-    # Для цілочисельної арифметики використовуємо стандартний метод
-    # Оптимізація тут в тому, що ми знаємо структуру матриці
-    return determinant_int(matrix)
+    return determinant_multimodular(matrix)
 
 
 def circulant_cofactor_column(matrix, col_idx=0, show_progress=False):
@@ -76,7 +139,7 @@ def circulant_cofactor_column(matrix, col_idx=0, show_progress=False):
     Args:
         matrix: циркулянтна матриця
         col_idx: індекс стовпця для обчислення (за замовчуванням 0)
-        show_progress: якщо True, виводить прогрес
+        show_progress: якщо True, повідомляє прогрес через telemetry
 
     Returns:
         list: стовпець кофакторів
@@ -86,105 +149,230 @@ def circulant_cofactor_column(matrix, col_idx=0, show_progress=False):
 
     n = len(matrix)
     cofactors = []
+    report = show_progress and telemetry.is_enabled()
 
     for i in range(n):
         minor_det = matrix_minor(matrix, i, col_idx)
         sign = (-1) ** (i + col_idx)
         cofactors.append(sign * minor_det)
-        if show_progress:
-            print(f"    Cofactor {i + 1}/{n}")
+        if report:
+            telemetry.progress('circulant_cofactors', i + 1, n)
 
     return cofactors
 
 
-def circulant_inverse(matrix, mod, show_progress=True):
-    """
-    Обчислює обернену матрицю для циркулянтної матриці.
-    Оптимізація: обчислюємо тільки перший стовпець кофакторів,
-    потім зсуваємо для отримання всієї матриці.
+def _poly_trim(a):
+    """Відкидає нульові старші коефіцієнти многочлена (коефіцієнти від молодших)"""
+    nonzero = np.nonzero(a)[0]
+    return a[:nonzero[-1] + 1] if len(nonzero) else a[:0]
 
-    Args:
-        matrix: циркулянтна матриця
-        mod: модуль
-        show_progress: якщо True, виводить прогрес у консоль для великих матриць
+
+def _poly_mul(a, b, q):
+    """Добуток многочленів з коефіцієнтами за модулем q"""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if min(len(a), len(b)) * (q - 1) ** 2 >= 2 ** 63:
+        # Запобігаємо переповненню int64 для дуже великих модулів
+        product = np.convolve(a.astype(object), b.astype(object))
+        return np.mod(product, q).astype(np.int64)
+    return np.mod(np.convolve(a, b), q)
+
+
+def _poly_mul_cyclic(a, b, q):
+    """Добуток у кільці Z_q[x]/(x^n - 1), тобто циклічна згортка довжини n"""
+    n = len(a)
+    full = _poly_mul(a, b, q)
+    result = full[:n].copy()
+    result[:len(full) - n] += full[n:]
+    return np.mod(result, q)
+
+
+def _poly_divmod(a, b, p):
+    """Ділення многочленів з остачею над полем Z_p"""
+    a = a.copy()
+    deg_b = len(b) - 1
+    if len(a) <= deg_b:
+        return np.zeros(0, dtype=np.int64), a
+
+    inv_lead = mod_inverse(int(b[-1]), p)
+    quotient = np.zeros(len(a) - deg_b, dtype=np.int64)
+
+    for i in range(len(a) - 1, deg_b - 1, -1):
+        coef = int(a[i]) * inv_lead % p
+        if coef:
+            quotient[i - deg_b] = coef
+            a[i - deg_b:i + 1] = np.mod(a[i - deg_b:i + 1] - coef * b, p)
+
+    return _poly_trim(quotient), _poly_trim(a[:deg_b])
+
+
+def _poly_inverse_cyclic_prime(a, p):
+    """
+    Обернений до a(x) у кільці Z_p[x]/(x^n - 1) розширеним алгоритмом Евкліда.
 
     Returns:
-        numpy array: обернена матриця за модулем
+        numpy array довжини n або None, якщо НСД(a(x), x^n - 1) ≠ 1
     """
-    global _circulant_matrix_log
+    n = len(a)
+    r0 = np.zeros(n + 1, dtype=np.int64)
+    r0[0], r0[n] = p - 1, 1  # x^n - 1
+    r1 = _poly_trim(np.mod(a, p))
+    t0 = np.zeros(0, dtype=np.int64)
+    t1 = np.ones(1, dtype=np.int64)
+
+    while len(r1):
+        quotient, remainder = _poly_divmod(r0, r1, p)
+        r0, r1 = r1, remainder
+        t_next = _poly_mul(quotient, t1, p)
+        size = max(len(t0), len(t_next))
+        t_next = np.mod(np.pad(t0, (0, size - len(t0))) - np.pad(t_next, (0, size - len(t_next))), p)
+        t0, t1 = t1, _poly_trim(t_next)
+
+    # НСД має бути ненульовою константою
+    if len(r0) != 1:
+        return None
+
+    t0 = np.mod(t0 * mod_inverse(int(r0[0]), p), p)
+    result = np.zeros(n, dtype=np.int64)
+    result[:len(t0)] = t0
+    return result
+
+
+def circulant_inverse_row(first_row, mod):
+    """
+    Обчислює перший рядок оберненої циркулянтної матриці.
 
-    if hasattr(matrix, 'tolist'):
-        matrix_list = matrix.tolist()
-    else:
-        matrix_list = matrix
+    Циркулянтна матриця з першим рядком c відповідає многочлену
+    c(x) = c0 + c1*x + ... + c(n-1)*x^(n-1) у кільці Z_m[x]/(x^n - 1):
+    перший рядок добутку циркулянтів - циклічна згортка перших рядків.
+    Тому обернена матриця - це обернений многочлен. Він шукається
+    розширеним алгоритмом Евкліда за модулем кожного простого p | m,
+    піднімається до p^e ітерацією Ньютона g <- g * (2 - c * g)
+    та об'єднується через китайську теорему про остачі - O(n²).
 
-    n = len(matrix_list)
-    show_log = show_progress and n >= 8
+    Args:
+        first_row: перший рядок циркулянтної матриці
+        mod: модуль
 
-    if show_log:
-        print(f"  Step 1/3: Computing determinant...")
+    Returns:
+        numpy array: перший рядок оберненої матриці за модулем
 
-    # Обчислюємо визначник
-    det = determinant_int(matrix_list, show_progress=show_log)
-    det_mod = det % mod
+    Raises:
+        ValueError: якщо матриця не оборотна за модулем
+    """
+    row = np.mod(np.array(first_row, dtype=np.int64), mod)
+    moduli = []
+    rows = []
 
-    if det_mod == 0:
-        raise ValueError(f"Детермінант {det} не має оберненого за модулем {mod}")
+    for p, e in factorize(mod):
+        q = p ** e
+        inv = _poly_inverse_cyclic_prime(row, p)
+        if inv is None:
+            raise ValueError(
+                f"Циркулянтна матриця не має оберненої за модулем {mod} "
+                f"(многочлен не взаємно простий з x^{len(row)} - 1 за модулем {p})"
+            )
 
-    if show_log:
-        print(f"  Step 2/3: Determinant = {det} (mod {mod} = {det_mod})")
+        # Підняття Ньютона: точність за модулем p^k подвоюється на кожному кроці
+        precision = 1
+        while precision < e:
+            correction = np.mod(-_poly_mul_cyclic(np.mod(row, q), inv, q), q)
+            correction[0] = (correction[0] + 2) % q
+            inv = _poly_mul_cyclic(inv, correction, q)
+            precision *= 2
 
-    # Знаходимо обернений елемент детермінанта
-    inv_det = None
-    for x in range(1, mod):
-        if (det_mod * x) % mod == 1:
-            inv_det = x
-            break
+        moduli.append(q)
+        rows.append(np.mod(inv, q))
 
-    if inv_det is None:
-        raise ValueError(f"Детермінант {det_mod} не має оберненого за модулем {mod}")
+    return crt_combine(rows, moduli)
 
-    if show_log:
-        print(f"  Step 3/3: Computing {n} cofactors (circulant optimization: only 1 column)...")
 
-    # Обчислюємо тільки перший стовпець кофакторів
-    first_col_cofactors = circulant_cofactor_column(matrix_list, 0, show_progress=show_log)
+def _matmul_mod(a, b, mod):
+    """Добуток матриць за модулем без переповнення int64"""
+    if a.shape[1] * (mod - 1) ** 2 >= 2 ** 63:
+        return np.mod(a.astype(object) @ b.astype(object), mod).astype(np.int64)
+    return np.mod(a @ b, mod)
 
-    # Застосовуємо mod до кофакторів відразу для уникнення переповнення
 
-    first_col_cofactors = [c % mod for c in first_col_cofactors]
+def verify_inverse_mod(matrix, inverse, mod, rounds=20):
+    """
+    Перевіряє, що inverse - обернена до matrix за модулем: K·K⁻¹ ≡ I (mod m).
 
-    # Логуємо оптимізацію
+    Перевірка Фрейвалдса: замість добутку матриць за O(n³) обидві матриці
+    множаться на випадкові вектори r і порівнюється K·(K⁻¹·r) з r - O(n²)
+    на вектор. Якщо K·K⁻¹ ≠ I, вектор проходить перевірку з імовірністю
+    не більше 1/2, тож хибно прийнята обернена має ймовірність ≤ 2^(-rounds).
 
-    _circulant_matrix_log.append({
+    Для двох CirculantMatrix перевірка точна: перший рядок добутку -
+    циклічна згортка перших рядків, яка має дорівнювати (1, 0, ..., 0).
 
-        'size': n,
+    Args:
+        matrix: квадратна матриця або CirculantMatrix
+        inverse: перевірювана обернена матриця
+        mod: модуль
+        rounds: кількість випадкових векторів
 
-        'determinant': det,
+    Returns:
+        bool: True, якщо обернена пройшла перевірку
+    """
+    if isinstance(matrix, CirculantMatrix) and isinstance(inverse, CirculantMatrix):
+        if len(matrix) != len(inverse):
+            return False
+        row = np.mod(np.array(matrix.first_row, dtype=np.int64), mod)
+        inv_row = np.mod(np.array(inverse.first_row, dtype=np.int64), mod)
+        product = _poly_mul_cyclic(row, inv_row, mod)
+        return bool(product[0] == 1 % mod and not product[1:].any())
+
+    matrix_np = np.mod(np.asarray(matrix, dtype=np.int64), mod)
+    inverse_np = np.mod(np.asarray(inverse, dtype=np.int64), mod)
+    n = len(matrix_np)
+    if matrix_np.shape != (n, n) or inverse_np.shape != (n, n):
+        return False
 
-        'optimization': 'single_column_cofactors'
+    vectors = np.random.default_rng().integers(0, mod, size=(n, rounds), dtype=np.int64)
+    product = _matmul_mod(matrix_np, _matmul_mod(inverse_np, vectors, mod), mod)
+    return bool(np.array_equal(product, vectors))
 
-    })
 
-    if show_log:
-        print(f"  Circulant matrix inversion complete!")
+def circulant_inverse(matrix, mod, show_progress=True):
+    """
+    Обчислює обернену матрицю для циркулянтної матриці.
+    Оптимізація: обертається тільки многочлен першого рядка
+    (circulant_inverse_row), решта рядків - циклічні зсуви.
 
-    # Будуємо обернену матрицю: транспонуємо та множимо на обернений детермінант
+    Args:
+        matrix: циркулянтна матриця
+        mod: модуль
+        show_progress: якщо True, повідомляє прогрес через telemetry для великих матриць
 
-    # Для циркулянтної матриці: cofactor[i][j] = first_col[(i - j) % n]
+    Returns:
+        numpy array: обернена матриця за модулем
+    """
+    # Для CirculantMatrix повна матриця не будується
+    if isinstance(matrix, CirculantMatrix):
+        first_row = matrix.first_row
+    elif hasattr(matrix, 'tolist'):
+        first_row = matrix.tolist()[0]
+    else:
+        first_row = matrix[0]
 
-    # adjugate[i][j] = cofactor[j][i] = first_col[(j - i) % n]
+    n = len(first_row)
+    report = show_progress and n >= 8 and telemetry.is_enabled()
 
-    inv_matrix = np.zeros((n, n), dtype=np.int64)
+    if report:
+        telemetry.progress('circulant_inverse', 0, 1)
 
-    for i in range(n):
+    inv_row = circulant_inverse_row(first_row, mod)
 
-        for j in range(n):
-            cofactor_val = first_col_cofactors[(j - i) % n]
+    # Логуємо оптимізацію
+    telemetry.record('circulant_inverse', size=n, modulus=mod, optimization='polynomial_inverse')
 
-            inv_matrix[i, j] = (inv_det * cofactor_val) % mod
+    if report:
+        telemetry.progress('circulant_inverse', 1, 1)
 
-    return inv_matrix
+    # Рядок i оберненої матриці - циклічний зсув першого рядка вправо на i
+    idx = np.mod(np.arange(n)[None, :] - np.arange(n)[:, None], n)
+    return inv_row[idx]
 
 
 @lru_cache(maxsize=128)
@@ -248,23 +436,20 @@ def validate_matrix_determinant_reversibility(matrix, modulus):
     Returns:
         tuple: (is_valid, det, error_message)
             - is_valid: True якщо детермінант оборотний
-            - det: значення детермінанта
+            - det: значення детермінанта за модулем
             - error_message: повідомлення про помилку (якщо is_valid = False)
-
-    Raises:
-        ValueError: якщо детермінант не оборотний за модулем
     """
-    det = determinant_int(matrix)
-    det_mod = det % modulus
+    # Для оборотності достатньо детермінанта за модулем (det_mod)
+    det = det_mod(matrix, modulus)
 
-    if det_mod == 0:
-        return False, det, f"Детермінант матриці ({det}) дорівнює 0 за модулем {modulus}. Матриця не оборотна!"
+    if det == 0:
+        return False, det, f"Детермінант матриці дорівнює 0 за модулем {modulus}. Матриця не оборотна!"
 
-    if not is_coprime(det_mod, modulus):
-        gcd_value = gcd(det_mod, modulus)
+    if not is_coprime(det, modulus):
+        gcd_value = gcd(det, modulus)
         return False, det, (
-            f"Детермінант матриці ({det}, mod {modulus} = {det_mod}) не є взаємно простим з модулем {modulus}.\n"
-            f"НСД({det_mod}, {modulus}) = {gcd_value} ≠ 1.\n"
+            f"Детермінант матриці (mod {modulus} = {det}) не є взаємно простим з модулем {modulus}.\n"
+            f"НСД({det}, {modulus}) = {gcd_value} ≠ 1.\n"
             f"Матриця не має оберненої за модулем {modulus} та не може бути використана для шифрування!"
         )
 
@@ -287,192 +472,601 @@ def mod_inverse(a, m):
     return t + m if t < 0 else t
 
 
-def determinant_int(matrix, show_progress=False):
+@lru_cache(maxsize=128)
+def factorize(n):
     """
-    Обчислення визначника матриці з використанням ТІЛЬКИ цілих чисел.
-    Використовує алгоритм Барейса (fraction-free Gaussian elimination) - O(n³).
+    Розкладає число на прості множники.
 
     Args:
-        matrix: квадратна матриця (numpy array або list of lists)
-        show_progress: якщо True, виводить прогрес у консоль для великих матриць
+        n: ціле число >= 1
 
     Returns:
-        int: визначник матриці
+        tuple: пари (p, e) - простий дільник та його степінь, за зростанням p
     """
-    # Convert to list of lists if numpy array
-    if hasattr(matrix, 'tolist'):
-        matrix = matrix.tolist()
+    factors = []
+    d = 2
+    while d * d <= n:
+        if n % d == 0:
+            e = 0
+            while n % d == 0:
+                n //= d
+                e += 1
+            factors.append((d, e))
+        d += 1 if d == 2 else 2
+    if n > 1:
+        factors.append((n, 1))
+    return tuple(factors)
+
+
+def crt_combine(residues, moduli):
+    """
+    Відновлює число за остачами (китайська теорема про остачі).
 
-    n = len(matrix)
+    Остачі можуть бути як цілими числами (довга арифметика Python), так і
+    numpy масивами однакової форми - тоді КТО застосовується поелементно
+    в int64 (добуток модулів має вміщуватися в int64).
 
-    # Base cases
-    if n == 1:
-        return int(matrix[0][0])
+    Args:
+        residues: остачі (цілі числа або numpy масиви)
+        moduli: попарно взаємно прості модулі
 
-    if n == 2:
-        return int(matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0])
+    Returns:
+        int або numpy array: x з [0, добуток модулів), для якого
+        x ≡ residues[i] (mod moduli[i])
+    """
+    x, m = 0, 1
+    for r, q in zip(residues, moduli):
+        if isinstance(r, np.ndarray):
+            r = r.astype(np.int64, copy=False)
+        # x + m * t ≡ r (mod q)
+        t = ((r - x) * mod_inverse(m, q)) % q
+        x = x + m * t
+        m *= q
+    return x
+
+
+def _solve_prime_power(a, b, p, q):
+    """
+    Розв'язок системи a · x ≡ b (mod q = p^e) методом Гаусса-Жордана, де a
+    має N >= n рядків і n стовпців. Опорні рядки обираються серед усіх N
+    (елемент, що не ділиться на p), тобто з рядків a автоматично
+    вибирається оборотна підсистема.
 
-    # Bareiss algorithm (fraction-free Gaussian elimination) - O(n³)
-    # Create a working copy with Python integers for exact arithmetic
-    M = [[int(matrix[i][j]) for j in range(n)] for i in range(n)]
+    Returns:
+        numpy array (n × k) або None, якщо ранг a за модулем p менший за n
+    """
+    n = a.shape[1]
+    aug = np.concatenate([np.mod(a, q), np.mod(b, q)], axis=1)
 
-    sign = 1  # Track sign changes from row swaps
-    prev_pivot = 1  # Previous pivot for division
+    for k in range(n):
+        candidates = np.nonzero(aug[k:, k] % p)[0]
+        if len(candidates) == 0:
+            return None
 
-    for k in range(n - 1):
-        # Progress logging for large matrices
-        if show_progress and n >= 8:
-            print(f"  Determinant calculation: step {k + 1}/{n - 1}")
+        pivot_row = k + int(candidates[0])
+        if pivot_row != k:
+            aug[[k, pivot_row]] = aug[[pivot_row, k]]
 
-        # Find pivot (non-zero element in column k)
-        pivot_row = None
-        for i in range(k, n):
-            if M[i][k] != 0:
-                pivot_row = i
-                break
+        aug[k] = (aug[k] * mod_inverse(int(aug[k, k]), q)) % q
+
+        factors = aug[:, k].copy()
+        factors[k] = 0
+        aug = np.mod(aug - np.outer(factors, aug[k]), q)
+
+    return aug[:n, n:]
+
+
+def solve_linear_mod(a, b, mod):
+    """
+    Розв'язує систему лінійних рівнянь a · x ≡ b (mod m).
+
+    Система розв'язується за модулем кожного степеня простого p^e | m
+    (опорні елементи - числа, що не діляться на p) і розв'язки
+    об'єднуються через китайську теорему про остачі. Рівнянь може бути
+    більше, ніж невідомих: зайві рівняння перевіряються на сумісність.
 
-        if pivot_row is None:
-            # Column is all zeros - determinant is 0
+    Args:
+        a: матриця коефіцієнтів N × n (N >= n)
+        b: права частина N × k (або вектор довжини N)
+        mod: модуль
+
+    Returns:
+        numpy array: єдиний розв'язок x (n × k або вектор довжини n)
+
+    Raises:
+        ValueError: якщо розв'язок не єдиний або система несумісна
+    """
+    a = np.mod(np.array(a, dtype=np.int64), mod)
+    b = np.mod(np.array(b, dtype=np.int64), mod)
+    vector = b.ndim == 1
+    if vector:
+        b = b[:, None]
+
+    if a.ndim != 2 or a.shape[0] != b.shape[0]:
+        raise ValueError("Розміри системи не узгоджені")
+    if a.shape[0] < a.shape[1]:
+        raise ValueError(f"Недостатньо рівнянь: {a.shape[0]} < {a.shape[1]}")
+
+    moduli = []
+    solutions = []
+    for p, e in factorize(mod):
+        q = p ** e
+        x = _solve_prime_power(a, b, p, q)
+        if x is None:
+            raise ValueError(
+                f"Ранг системи за модулем {p} менший за кількість невідомих - розв'язок не єдиний"
+            )
+        moduli.append(q)
+        solutions.append(x)
+
+    x = crt_combine(solutions, moduli)
+
+    if np.mod(_matmul_mod(a, x, mod) - b, mod).any():
+        raise ValueError("Система несумісна")
+
+    return x[:, 0] if vector else x
+
+
+def _det_prime_power(matrix, p, e):
+    """
+    Детермінант за модулем q = p^e методом Гаусса - O(n³).
+    Опорним обирається елемент з найменшою p-валюацією: решта елементів
+    стовпця діляться на той самий степінь p, тому рядки виключаються
+    без ділення на необоротні елементи (визначник не змінюється).
+
+    Returns:
+        int: детермінант за модулем q
+    """
+    q = p ** e
+    mat = np.mod(np.array(matrix, dtype=np.int64), q)
+    n = mat.shape[0]
+    det = 1
+
+    for k in range(n):
+        column = mat[k:, k]
+
+        # p-валюація кожного елемента стовпця (обмежена e; нуль має валюацію e)
+        valuation = _batch_valuation(column, p, e)
+
+        best = int(np.argmin(valuation))
+        v = int(valuation[best])
+        if v == e:
             return 0
 
-        # Swap rows if needed
+        pivot_row = k + best
         if pivot_row != k:
-            M[k], M[pivot_row] = M[pivot_row], M[k]
-            sign = -sign
+            mat[[k, pivot_row]] = mat[[pivot_row, k]]
+            det = -det
 
-        # Bareiss elimination
-        pivot = M[k][k]
-        for i in range(k + 1, n):
-            for j in range(k + 1, n):
-                # Bareiss formula: M[i][j] = (M[k][k] * M[i][j] - M[i][k] * M[k][j]) / prev_pivot
-                # This is guaranteed to divide exactly
-                M[i][j] = (pivot * M[i][j] - M[i][k] * M[k][j]) // prev_pivot
-            M[i][k] = 0  # Clear column below pivot
+        pivot = int(mat[k, k])
+        det = det * pivot % q
 
-        prev_pivot = pivot
+        # pivot = p^v * u, елементи нижче = p^v * w, множник w * u^(-1)
+        scale = p ** v
+        unit_inv = mod_inverse(pivot // scale, q)
+        factors = np.mod((mat[k + 1:, k] // scale) * unit_inv, q)
+        mat[k + 1:] = np.mod(mat[k + 1:] - np.outer(factors, mat[k]), q)
 
-    # The determinant is the last diagonal element, adjusted for sign
-    return sign * M[n - 1][n - 1]
+    return det % q
 
 
-def determinant(matrix):
-    """Обчислення визначника матриці"""
-    return determinant_int(matrix)
+def det_mod(matrix, mod):
+    """
+    Детермінант матриці за модулем без обчислення точного цілого значення.
+    Виключення виконується за модулем кожного степеня простого p^e | mod,
+    результати об'єднуються через китайську теорему про остачі.
 
+    Args:
+        matrix: квадратна матриця (numpy array або list of lists)
+        mod: модуль
 
-def matrix_minor(matrix, i, j):
-    """Обчислення мінора матриці з використанням цілочисельної арифметики"""
-    # Convert to list of lists if numpy array
-    if hasattr(matrix, 'tolist'):
-        matrix = matrix.tolist()
+    Returns:
+        int: детермінант за модулем mod (від 0 до mod - 1)
+    """
+    if mod == 1:
+        return 0
 
-    n = len(matrix)
-    # Build minor matrix (exclude row i and column j)
-    minor = []
-    for row in range(n):
-        if row == i:
-            continue
-        minor_row = []
-        for col in range(n):
-            if col != j:
-                minor_row.append(matrix[row][col])
-        minor.append(minor_row)
+    factors = factorize(mod)
+    residues = [_det_prime_power(matrix, p, e) for p, e in factors]
+    return crt_combine(residues, [p ** e for p, e in factors])
 
-    return determinant_int(minor)
 
+def _batch_valuation(values, p, e):
+    """p-валюація елементів масиву, обмежена e (нуль має валюацію e)"""
+    valuation = np.zeros(values.shape, dtype=np.int64)
+    power = 1
+    for _ in range(e):
+        power *= p
+        valuation += (values % power == 0)
+    return valuation
 
-def matrix_mod_inverse(matrix, mod, show_progress=True):
+
+def _batch_det_prime_power(mats, p, e):
     """
-    Обчислення оберненої матриці по модулю з цілочисельною арифметикою.
-    Автоматично визначає циркулянтні матриці та використовує оптимізований алгоритм.
+    Детермінанти пакета матриць (batch × n × n) за модулем q = p^e.
+    Той самий алгоритм, що й _det_prime_power, але кожен крок виключення
+    виконується одразу для всіх матриць пакета.
+    """
+    q = p ** e
+    mats = np.mod(mats, q)
+    batch, n, _ = mats.shape
+    index = np.arange(batch)
+    det = np.ones(batch, dtype=np.int64)
+    phi = q // p * (p - 1)
+
+    for c in range(n):
+        valuation = _batch_valuation(mats[:, c:, c], p, e)
+        pivot_row = c + np.argmin(valuation, axis=1)
+        v = valuation[index, pivot_row - c]
+
+        swap = pivot_row != c
+        if swap.any():
+            rows_c = mats[index, c].copy()
+            mats[index, c] = mats[index, pivot_row]
+            mats[index, pivot_row] = rows_c
+            det = np.where(swap, (q - det) % q, det)
+
+        # Якщо весь стовпець ділиться на q, pivot = 0 і детермінант 0
+        pivot = mats[:, c, c]
+        det = det * pivot % q
+        if c == n - 1:
+            break
+
+        # pivot = p^v * u; обернений до u за теоремою Ейлера: u^(φ(q) - 1)
+        scale = p ** v
+        unit_inv = _pow_mod_array(pivot // scale, np.full(batch, phi - 1, dtype=np.int64), q)
+        factors = (mats[:, c + 1:, c] // scale[:, None]) * unit_inv[:, None] % q
+        mats[:, c + 1:, c:] = np.mod(mats[:, c + 1:, c:] - factors[:, :, None] * mats[:, None, c, c:], q)
+
+    return det
+
+
+def _batch_inverse_prime_power(mats, p, e):
+    """
+    Обернені матриці пакета (batch × n × n) за модулем q = p^e
+    методом Гаусса-Жордана з оборотними опорними елементами.
+
+    Returns:
+        tuple: (inverses, mask) - для необоротних матриць обернена невизначена
+    """
+    q = p ** e
+    batch, n, _ = mats.shape
+    index = np.arange(batch)
+    phi = q // p * (p - 1)
+
+    eye = np.broadcast_to(np.eye(n, dtype=np.int64), (batch, n, n))
+    aug = np.concatenate([np.mod(mats, q), eye], axis=2)
+    mask = np.ones(batch, dtype=bool)
+
+    for c in range(n):
+        units = aug[:, c:, c] % p != 0
+        mask &= units.any(axis=1)
+        pivot_row = c + np.argmax(units, axis=1)
+
+        swap = pivot_row != c
+        if swap.any():
+            rows_c = aug[index, c].copy()
+            aug[index, c] = aug[index, pivot_row]
+            aug[index, pivot_row] = rows_c
+
+        pivot_inv = _pow_mod_array(aug[:, c, c], np.full(batch, phi - 1, dtype=np.int64), q)
+        aug[:, c] = aug[:, c] * pivot_inv[:, None] % q
+
+        factors = aug[:, :, c].copy()
+        factors[:, c] = 0
+        aug = np.mod(aug - factors[:, :, None] * aug[:, None, c], q)
+
+    return aug[:, :, n:], mask
+
+
+def _as_batch(matrices, mod):
+    """Перетворює пакет матриць на масив int64 (batch × n × n)"""
+    if mod >= _WORD_PRIME_LIMIT:
+        raise ValueError(f"Модуль {mod} завеликий для пакетної обробки (максимум 2^31 - 1)")
+
+    mats = np.array(matrices, dtype=np.int64)
+    if mats.ndim != 3 or mats.shape[1] != mats.shape[2]:
+        raise ValueError("Очікується масив квадратних матриць форми (batch, n, n)")
+    return mats
+
+
+def batch_det_mod(matrices, mod):
+    """
+    Детермінанти пакета матриць за модулем без циклу по матрицях.
 
     Args:
-        matrix: квадратна матриця
-        mod: модуль
-        show_progress: якщо True, виводить прогрес у консоль для великих матриць
+        matrices: масив форми (batch, n, n)
+        mod: модуль (< 2^31)
 
     Returns:
-        numpy array: обернена матриця за модулем
+        numpy array: детермінанти за модулем, форма (batch,)
     """
-    global _circulant_matrix_log
+    mats = _as_batch(matrices, mod)
+    if mod == 1:
+        return np.zeros(mats.shape[0], dtype=np.int64)
 
-    n = matrix.shape[0]
-    show_log = show_progress and n >= 8  # Show progress for matrices 8x8 and larger
+    factors = factorize(mod)
+    residues = [_batch_det_prime_power(mats, p, e) for p, e in factors]
+    return crt_combine(residues, [p ** e for p, e in factors])
 
-    # Перевіряємо чи матриця циркулянтна
-    if is_circulant_matrix(matrix):
-        if show_log:
-            print(f"[Optimization] Detected circulant {n}x{n} matrix - using fast algorithm")
-        # Логуємо використання оптимізації (без виведення на екран)
-        _circulant_matrix_log.append({
-            'size': n,
-            'type': 'circulant_detected',
-            'optimization': 'using_circulant_inverse'
-        })
-        return circulant_inverse(matrix, mod, show_progress=show_progress)
 
-    if show_log:
-        print(f"[Matrix Inversion] Computing {n}x{n} matrix inverse...")
-        print(f"  Step 1/3: Computing determinant...")
+def batch_matrix_mod_inverse(matrices, mod):
+    """
+    Обернені за модулем для пакета матриць. Виключення Гаусса-Жордана
+    виконується одночасно для всього пакета за модулем кожного p^e | mod,
+    результати об'єднуються через КТО.
+
+    Args:
+        matrices: масив форми (batch, n, n)
+        mod: модуль (< 2^31)
 
-    det = determinant_int(matrix, show_progress=show_log)
-    det_mod = det % mod
+    Returns:
+        tuple: (inverses, mask)
+            - inverses: масив (batch, n, n); для необоротних матриць - нулі
+            - mask: масив bool (batch,), True якщо матриця оборотна
+    """
+    mats = _as_batch(matrices, mod)
+    batch, n, _ = mats.shape
 
-    if det_mod == 0:
-        raise ValueError(f"Детермінант {det} не має оберненого за модулем {mod}")
+    moduli = []
+    inverses = []
+    mask = np.ones(batch, dtype=bool)
 
-    if show_log:
-        print(f"  Step 2/3: Determinant = {det} (mod {mod} = {det_mod})")
+    for p, e in factorize(mod):
+        inv, ok = _batch_inverse_prime_power(mats, p, e)
+        moduli.append(p ** e)
+        inverses.append(inv)
+        mask &= ok
 
-    # Знаходимо обернений елемент детермінанта
-    inv_det = None
-    for x in range(1, mod):
-        if (det_mod * x) % mod == 1:
-            inv_det = x
+    result = crt_combine(inverses, moduli) if moduli else np.zeros_like(mats)
+    result[~mask] = 0
+    return result, mask
+
+
+def _is_word_prime(n):
+    """Детермінований тест Міллера-Рабіна для n < 3 215 031 751"""
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7):
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in (2, 3, 5, 7):
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _word_prime(index):
+    """Повертає index-те за спаданням просте число, менше за 2^31 (кешується)"""
+    candidate = _word_primes[-1] if _word_primes else _WORD_PRIME_LIMIT
+    while len(_word_primes) <= index:
+        candidate -= 1
+        if _is_word_prime(candidate):
+            _word_primes.append(candidate)
+    return _word_primes[index]
+
+
+def _pow_mod_array(base, exponent, mod):
+    """Поелементне піднесення до степеня за модулем (mod < 2^31)"""
+    result = np.ones_like(base)
+    base = base % mod
+    exponent = exponent.copy()
+    while exponent.any():
+        odd = (exponent & 1).astype(bool)
+        result = np.where(odd, result * base % mod, result)
+        base = base * base % mod
+        exponent >>= 1
+    return result
+
+
+def _det_word_primes(reduced, primes):
+    """
+    Детермінанти однієї матриці за модулем кількох простих p < 2^31 одночасно.
+    Виключення Гаусса виконується для всіх модулів разом над масивом
+    (кількість_простих, n, n), тому кожен крок - кілька операцій numpy.
+
+    Args:
+        reduced: масив (кількість_простих, n, n), зведений за відповідними модулями
+        primes: numpy array простих чисел
+
+    Returns:
+        numpy array: детермінант за модулем кожного простого
+    """
+    mats = reduced.copy()
+    k, n, _ = mats.shape
+    p = primes.astype(np.int64)
+    det = np.ones(k, dtype=np.int64)
+    batch = np.arange(k)
+
+    for c in range(n):
+        nonzero = mats[:, c:, c] != 0
+        pivot_row = c + np.argmax(nonzero, axis=1)
+
+        # Перестановка рядків змінює знак детермінанта
+        swap = pivot_row != c
+        if swap.any():
+            rows_c = mats[batch, c].copy()
+            mats[batch, c] = mats[batch, pivot_row]
+            mats[batch, pivot_row] = rows_c
+            det = np.where(swap, (p - det) % p, det)
+
+        # Якщо стовпець нульовий, pivot = 0 і детермінант за цим модулем 0
+        pivot = mats[:, c, c]
+        det = det * pivot % p
+        if c == n - 1:
             break
 
-    if inv_det is None:
-        raise ValueError(f"Детермінант {det_mod} не має оберненого за модулем {mod}")
+        # Обернені опорні елементи за малою теоремою Ферма: pivot^(p-2)
+        pivot_inv = _pow_mod_array(pivot, p - 2, p)
+        factors = mats[:, c + 1:, c] * pivot_inv[:, None] % p[:, None]
+        mats[:, c + 1:, c:] = (mats[:, c + 1:, c:] - factors[:, :, None] * mats[:, None, c, c:]) % p[:, None, None]
 
-    if show_log:
-        print(f"  Step 3/3: Computing {n}x{n} cofactor matrix ({n*n} minors)...")
+    return det
 
-    # Обчислюємо матрицю кофакторів (використовуємо Python list для великих чисел)
 
-    cofactors = [[0] * n for _ in range(n)]
+def determinant_multimodular(matrix):
+    """
+    Точний цілий визначник мультимодульним методом.
 
-    total_minors = n * n
+    Детермінант обчислюється за модулем простих чисел p < 2^31 звичайним
+    виключенням Гаусса в int64 (без великих чисел) і відновлюється через
+    китайську теорему про остачі. Кількість простих визначається оцінкою
+    Адамара |det| <= prod ||row_i||: коли добуток модулів перевищує
+    подвоєну оцінку, результат у симетричному діапазоні точний.
 
-    for i in range(n):
+    Args:
+        matrix: квадратна матриця (numpy array або list of lists)
 
-        for j in range(n):
-            minor_det = matrix_minor(matrix, i, j)
+    Returns:
+        int: визначник матриці
+    """
+    if hasattr(matrix, 'tolist'):
+        matrix = matrix.tolist()
 
-            sign = 1 if (i + j) % 2 == 0 else -1
+    rows = [[int(x) for x in row] for row in matrix]
+    n = len(rows)
+    if n == 0:
+        return 1
 
-            # Застосовуємо mod відразу для уникнення переповнення
+    # log2 оцінки Адамара
+    bound_bits = 0.0
+    for row in rows:
+        norm_sq = sum(x * x for x in row)
+        if norm_sq == 0:
+            return 0
+        bound_bits += math.log2(norm_sq) / 2
+
+    # Кількість простих, добуток яких перевищує подвоєну оцінку
+    primes = []
+    product_bits = 0.0
+    while product_bits <= bound_bits + 1:
+        primes.append(_word_prime(len(primes)))
+        product_bits += math.log2(primes[-1])
+
+    # Якщо елементи вміщуються в int64, зведення за модулем - одна операція numpy
+    if all(-2 ** 63 < x < 2 ** 63 for row in rows for x in row):
+        base = np.array(rows, dtype=np.int64)
+    else:
+        base = None
 
-            cofactors[i][j] = (sign * minor_det) % mod
+    residues = []
 
-        # Progress update per row
+    # Прості обробляються групами, щоб обмежити пам'ять (група × n × n)
+    group = max(1, min(len(primes), 2 ** 22 // (n * n)))
+    for start in range(0, len(primes), group):
+        chunk = np.array(primes[start:start + group], dtype=np.int64)
 
-        if show_log:
-            done = (i + 1) * n
+        if base is not None:
+            reduced = np.mod(base[None, :, :], chunk[:, None, None])
+        else:
+            reduced = np.array(
+                [[[x % int(p) for x in row] for row in rows] for p in chunk],
+                dtype=np.int64
+            )
 
-            print(f"    Cofactors: {done}/{total_minors} ({100 * done // total_minors}%)")
+        residues.extend(_det_word_primes(reduced, chunk).tolist())
 
-    if show_log:
-        print(f"  Matrix inversion complete!")
+    residue = crt_combine(residues, primes)
+    modulus = math.prod(primes)
 
-    # Транспонуємо (adjugate = cofactors^T) та множимо на обернений детермінант
+    # Переходимо до симетричного діапазону (-modulus/2, modulus/2]
+    if residue > modulus // 2:
+        residue -= modulus
+    return residue
 
-    inv_matrix = np.zeros((n, n), dtype=np.int64)
 
-    for i in range(n):
+def determinant_int(matrix, show_progress=False):
+    """
+    Точний цілий визначник матриці (мультимодульний метод).
+    Залишено для сумісності: раніше обчислювався алгоритмом Барейса,
+    show_progress більше не використовується.
+
+    Args:
+        matrix: квадратна матриця (numpy array або list of lists)
 
-        for j in range(n):
-            # Транспонування: inv_matrix[i][j] = cofactors[j][i]
+    Returns:
+        int: визначник матриці
+    """
+    return determinant_multimodular(matrix)
+
+
+def determinant(matrix):
+    """Обчислення визначника матриці (мультимодульний метод)"""
+    return determinant_multimodular(matrix)
 
-            inv_matrix[i, j] = (inv_det * cofactors[j][i]) % mod
 
-    return inv_matrix
\ No newline at end of file
+def matrix_minor(matrix, i, j):
+    """Обчислення мінора матриці з використанням цілочисельної арифметики"""
+    # Convert to list of lists if numpy array
+    if hasattr(matrix, 'tolist'):
+        matrix = matrix.tolist()
+
+    # Build minor matrix (exclude row i and column j)
+    minor = [
+        [value for col, value in enumerate(row) if col != j]
+        for r, row in enumerate(matrix) if r != i
+    ]
+
+    return determinant_multimodular(minor)
+
+
+def matrix_mod_inverse(matrix, mod, show_progress=True):
+    """
+    Обчислення оберненої матриці по модулю методом Гаусса-Жордана - O(n³).
+    Для складеного модуля обернена шукається за модулем кожного степеня
+    простого числа і відновлюється через китайську теорему про остачі.
+    Автоматично визначає циркулянтні матриці та використовує оптимізований алгоритм.
+
+    Args:
+        matrix: квадратна матриця
+        mod: модуль
+        show_progress: якщо True, повідомляє прогрес через telemetry для великих матриць
+
+    Returns:
+        numpy array: обернена матриця за модулем
+    """
+    n = len(matrix)
+    report = show_progress and n >= 8 and telemetry.is_enabled()  # Прогрес для матриць від 8x8
+
+    # Перевіряємо чи матриця циркулянтна
+    if n > 1 and is_circulant_matrix(matrix):
+        # Логуємо використання оптимізації
+        telemetry.record('circulant_detected', size=n, optimization='using_circulant_inverse')
+        return circulant_inverse(matrix, mod, show_progress=show_progress)
+
+    telemetry.record('matrix_inverse', size=n, modulus=mod, method='gauss_jordan')
+
+    # Обертаємо за модулем кожного степеня простого p^e та об'єднуємо через КТО.
+    # За модулем p^e опорні елементи - числа, що не діляться на p
+    matrix_np = np.mod(np.array(matrix, dtype=np.int64), mod)
+    moduli = []
+    inverses = []
+
+    factors = factorize(mod)
+    for step, (p, e) in enumerate(factors, 1):
+        q = p ** e
+        inv = _solve_prime_power(matrix_np, np.eye(n, dtype=np.int64), p, q)
+        if report:
+            telemetry.progress('matrix_inverse', step, len(factors))
+        if inv is None:
+            raise ValueError(
+                f"Детермінант матриці не взаємно простий з модулем {mod} (ділиться на {p}). "
+                f"Матриця не має оберненої за модулем {mod}"
+            )
+        moduli.append(q)
+        inverses.append(inv)
+
+    return crt_combine(inverses, moduli)
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+Телеметрія обчислень: прогрес та журнал подій
+"""
+
+import threading
+import time
+from collections import deque
+
+# Розмір кільцевого буфера подій за замовчуванням
+DEFAULT_EVENT_LOG_SIZE = 256
+
+_events = deque(maxlen=DEFAULT_EVENT_LOG_SIZE)
+_sinks = []
+_lock = threading.Lock()
+
+# Описи подій для інтерфейсу
+_EVENT_DESCRIPTIONS = {
+    'matrix_inverse': "Обернення матриці {size}x{size} (mod {modulus})",
+    'circulant_detected': "Циркулянтна матриця {size}x{size}",
+    'circulant_inverse': "Обернення циркулянтної матриці {size}x{size} (mod {modulus})",
+    'timing': "{operation}: {seconds:.6f} с",
+}
+
+# Назви етапів для подій прогресу
+_STAGE_NAMES = {
+    'matrix_inverse': "Обернення матриці",
+    'circulant_inverse': "Обернення циркулянтної матриці",
+    'circulant_cofactors': "Кофактори циркулянтної матриці",
+}
+
+
+def add_sink(callback):
+    """
+    Реєструє обробник подій.
+
+    Обробник callback(event) отримує словник з ключами 'event' (назва події),
+    'time' (time.time()) та полями події. Події прогресу мають назву
+    'progress' і поля 'stage', 'step', 'total'. Обробник викликається в
+    потоці, який виконує обчислення.
+
+    Args:
+        callback: функція, що приймає словник події
+    """
+    with _lock:
+        if callback not in _sinks:
+            _sinks.append(callback)
+
+
+def remove_sink(callback):
+    """Видаляє обробник подій (якщо він зареєстрований)"""
+    with _lock:
+        if callback in _sinks:
+            _sinks.remove(callback)
+
+
+def is_enabled():
+    """True, якщо зареєстровано хоча б один обробник подій"""
+    return bool(_sinks)
+
+
+def _dispatch(event):
+    for callback in tuple(_sinks):
+        try:
+            callback(event)
+        except Exception:
+            # Помилка обробника не повинна переривати обчислення
+            pass
+
+
+def record(event, **fields):
+    """
+    Записує подію в журнал (кільцевий буфер) та передає обробникам.
+
+    Args:
+        event: назва події
+        **fields: поля події
+    """
+    entry = {'event': event, 'time': time.time(), **fields}
+    _events.append(entry)
+    if _sinks:
+        _dispatch(entry)
+
+
+def progress(stage, step, total):
+    """
+    Повідомляє про прогрес обчислення. Події прогресу не записуються
+    в журнал; без зареєстрованих обробників виклик нічого не робить.
+
+    Args:
+        stage: назва етапу
+        step: поточний крок
+        total: загальна кількість кроків
+    """
+    if _sinks:
+        _dispatch({'event': 'progress', 'time': time.time(),
+                   'stage': stage, 'step': step, 'total': total})
+
+
+def get_events(event=None):
+    """
+    Повертає копію журналу подій (від найстаріших).
+
+    Args:
+        event: якщо задано, тільки події з цією назвою (або кортежем назв)
+    """
+    entries = list(_events)
+    if event is None:
+        return entries
+    names = (event,) if isinstance(event, str) else tuple(event)
+    return [entry for entry in entries if entry['event'] in names]
+
+
+def clear_events():
+    """Очищає журнал подій"""
+    _events.clear()
+
+
+def set_event_log_size(size):
+    """Змінює розмір кільцевого буфера журналу (зберігаючи останні події)"""
+    global _events
+    _events = deque(_events, maxlen=size)
+
+
+def describe(event):
+    """Текстовий опис події для відображення в інтерфейсі"""
+    if event['event'] == 'progress':
+        stage = _STAGE_NAMES.get(event['stage'], event['stage'])
+        return f"{stage}: крок {event['step']}/{event['total']}"
+
+    template = _EVENT_DESCRIPTIONS.get(event['event'])
+    if template is None:
+        return event['event']
+    try:
+        return template.format(**event)
+    except (KeyError, ValueError):
+        return event['event']
+
+
+def print_sink(event):
+    """Обробник, що виводить події в консоль (для запуску без інтерфейсу)"""
+    print(describe(event))
+
+
+class StatusLine:
+    """
+    Рядок стану вікна, що відображає події телеметрії.
+
+    Створює мітку внизу вікна, реєструє обробник подій і відключає його
+    при закритті вікна. Події з робочих потоків передаються в головний
+    потік через window.after.
+    """
+
+    def __init__(self, window, **label_options):
+        """
+        Args:
+            window: вікно tkinter (Tk або Toplevel)
+            **label_options: параметри оформлення мітки (bg, fg, font)
+        """
+        import tkinter as tk
+
+        self.window = window
+        self.var = tk.StringVar(master=window, value="")
+        tk.Label(window, textvariable=self.var, **label_options).pack(side="bottom", pady=5)
+
+        add_sink(self.on_event)
+        window.bind("<Destroy>", self.on_destroy, add="+")
+
+    def on_event(self, event):
+        """Відображення події телеметрії в рядку стану"""
+        text = describe(event)
+        if threading.current_thread() is threading.main_thread():
+            self.var.set(text)
+            self.window.update_idletasks()
+        else:
+            self.window.after(0, self.var.set, text)
+
+    def on_destroy(self, event):
+        """Відключення від телеметрії при закритті вікна"""
+        if event.widget is self.window:
+            remove_sink(self.on_event)